@@ -0,0 +1,107 @@
+"""
+Benchmark the vectorized all-time stats path against the original per-team-week loop.
+
+    python benchmarks/bench_all_time_stats.py
+
+Runs synthetic leagues (see synthetic.py) of 8-32 teams with 5-30 seasons of history and prints the speedup.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import games  # noqa: E402
+from league_data import get_playoff_start_week  # noqa: E402
+from stats import all_time_stats_from_seasons  # noqa: E402
+from synthetic import generate_league  # noqa: E402
+
+TEAM_COUNTS = [8, 12, 16, 24, 32]
+SEASON_COUNTS = [5, 10, 20, 30]
+REPEATS = 5
+
+
+def loop_all_time_stats(seasons):
+    """The original implementation: walk every team-week in Python and update nested dicts"""
+    all_time_stats = {}
+    for season in seasons:
+        teams_by_id = {team['team_id']: team for team in season['teams']}
+        playoff_start_week = get_playoff_start_week(season['year'])
+
+        for team in season['teams']:
+            owner_stats = all_time_stats.setdefault(team['owner'], {
+                'regular_season': {'total_points': 0, 'wins': 0, 'losses': 0, 'ties': 0},
+                'playoffs': {'total_points': 0, 'wins': 0, 'losses': 0, 'ties': 0, 'appearances': 0},
+                'years_played': 0
+            })
+            playoff_games = 0
+            for week_num in range(min(len(team['scores']), season['current_week'])):
+                if week_num < len(team['schedule']) and team['scores'][week_num] is not None:
+                    opponent = teams_by_id.get(team['schedule'][week_num])
+                    if opponent is not None and week_num < len(opponent['scores']):
+                        team_score = team['scores'][week_num]
+                        opp_score = opponent['scores'][week_num]
+                        if opp_score is not None:
+                            if week_num + 1 < playoff_start_week:
+                                totals = owner_stats['regular_season']
+                            else:
+                                totals = owner_stats['playoffs']
+                                playoff_games += 1
+                            totals['total_points'] += team_score
+                            if team_score > opp_score:
+                                totals['wins'] += 1
+                            elif team_score < opp_score:
+                                totals['losses'] += 1
+                            else:
+                                totals['ties'] += 1
+
+            if playoff_games > 0:
+                owner_stats['playoffs']['appearances'] += 1
+            owner_stats['years_played'] += 1
+
+    return all_time_stats
+
+def best_time(func, seasons, cold=False):
+    timings = []
+    for _ in range(REPEATS):
+        if cold:
+            # Include building the per-season score matrices
+            games._games_cache.clear()
+        start = time.perf_counter()
+        result = func(seasons)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def same_stats(a, b):
+    if a.keys() != b.keys():
+        return False
+    for owner in a:
+        if a[owner]['years_played'] != b[owner]['years_played']:
+            return False
+        for period in ['regular_season', 'playoffs']:
+            for stat, value in a[owner][period].items():
+                if abs(value - b[owner][period][stat]) > 1e-6:
+                    return False
+    return True
+
+def main():
+    print(f"{'teams':>5} {'seasons':>7} {'loop ms':>9} {'cold ms':>9} {'warm ms':>9} {'speedup':>8}")
+    for n_teams in TEAM_COUNTS:
+        for n_seasons in SEASON_COUNTS:
+            seasons = generate_league(
+                league_id=n_teams * 100 + n_seasons, n_teams=n_teams, n_seasons=n_seasons,
+                first_year=2025 - n_seasons, roster_size=0, seed=2024
+            )
+
+            loop_time, expected = best_time(loop_all_time_stats, seasons)
+            cold_time, _ = best_time(all_time_stats_from_seasons, seasons, cold=True)
+            warm_time, result = best_time(all_time_stats_from_seasons, seasons)
+            if not same_stats(expected, result):
+                raise AssertionError(f"Vectorized stats differ for {n_teams} teams / {n_seasons} seasons")
+
+            print(f"{n_teams:>5} {n_seasons:>7} {loop_time * 1000:>9.2f} {cold_time * 1000:>9.2f} "
+                  f"{warm_time * 1000:>9.2f} {loop_time / warm_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Benchmark the aggregation hot paths on synthetic leagues of several sizes and save the results as JSON.
+
+    python benchmarks/bench_hot_paths.py [--quick] [--output results.json] [--compare baseline.json]
+
+Cases: H2H records (get_all_time_h2h_by_scores_fixed), the three H2H matrices (create_h2h_matrix),
+all-time stats (calculate_all_time_stats), the Player Analysis index (build_player_index), and the
+aggregation loops on their own (build_h2h_arrays, all_time_stats_from_seasons).
+Each is timed cold (best of REPEATS, per-season tables and persisted aggregates cleared before every
+run, so the aggregation is redone) and warm (best of REPEATS with everything cached - for the
+dashboard cases that is mostly reading the persisted aggregates). Memory comes from one cold run
+under tracemalloc: peak_kb is the peak traced size, allocated_blocks / allocated_kb what the run
+left allocated (mostly its caches).
+
+Results go to benchmarks/results/<commit>.json by default; --compare prints the cold and warm time
+ratios against an earlier file, so a slower change shows up as a ratio above 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+# Aggregates are persisted under the snapshot dir - keep the benchmark's away from the real ones
+os.environ['FFA_SNAPSHOT_DIR'] = tempfile.mkdtemp(prefix='ffa-bench-')
+os.environ['FFA_BACKGROUND_REFRESH'] = '0'
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import dashboard_data  # noqa: E402
+import games  # noqa: E402
+import league_data  # noqa: E402
+from h2h import RECORD_TYPES, build_h2h_arrays  # noqa: E402
+from players import build_player_index  # noqa: E402
+from stats import all_time_stats_from_seasons  # noqa: E402
+from synthetic import generate_league, install_league  # noqa: E402
+
+# (teams, seasons of history)
+LEAGUE_SIZES = [(10, 6), (12, 10), (16, 20), (24, 20), (32, 20)]
+QUICK_LEAGUE_SIZES = [(10, 6), (16, 10)]
+ROSTER_SIZE = 16
+REPEATS = 5
+
+
+def h2h_records(league_id, seasons):
+    dashboard_data.get_all_time_h2h_by_scores_fixed(league_id, seasons[0]['year'], seasons[-1]['year'])
+
+def h2h_matrices(league_id, seasons):
+    for record_type in RECORD_TYPES:
+        dashboard_data.create_h2h_matrix(league_id, seasons[0]['year'], seasons[-1]['year'], record_type=record_type)
+
+def all_time_stats(league_id, seasons):
+    dashboard_data.calculate_all_time_stats(league_id, seasons[0]['year'], seasons[-1]['year'], None, None)
+
+def player_index(league_id, seasons):
+    build_player_index(seasons[-1])
+
+def h2h_arrays(league_id, seasons):
+    build_h2h_arrays(seasons)
+
+def all_time_stats_loop(league_id, seasons):
+    all_time_stats_from_seasons(seasons)
+
+CASES = {
+    'h2h_records': h2h_records,
+    'h2h_matrices': h2h_matrices,
+    'all_time_stats': all_time_stats,
+    'player_index': player_index,
+    'h2h_arrays': h2h_arrays,
+    'all_time_loop': all_time_stats_loop
+}
+
+
+def clear_caches(league_id):
+    """Forget per-season tables and persisted aggregates, as a fresh process would"""
+    with games._games_cache_lock:
+        games._games_cache.clear()
+    shutil.rmtree(os.path.join(league_data.SNAPSHOT_DIR, str(league_id), 'aggregates'), ignore_errors=True)
+
+def measure(case, league_id, seasons):
+    cold = []
+    for _ in range(REPEATS):
+        clear_caches(league_id)
+        start = time.perf_counter()
+        case(league_id, seasons)
+        cold.append(time.perf_counter() - start)
+
+    warm = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        case(league_id, seasons)
+        warm.append(time.perf_counter() - start)
+
+    clear_caches(league_id)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    case(league_id, seasons)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = after.compare_to(before, 'filename')
+
+    return {
+        'cold_ms': round(min(cold) * 1000, 3),
+        'warm_ms': round(min(warm) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'allocated_blocks': sum(stat.count_diff for stat in retained),
+        'allocated_kb': round(sum(stat.size_diff for stat in retained) / 1024, 1)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['case'], r['teams'], r['seasons']): r for r in baseline['results']}
+
+    def ratio(result, before, timing):
+        if not before.get(timing):
+            return float('nan')
+        return result[timing] / before[timing]
+
+    print(f"\nvs {baseline['commit']} (ratio > 1 is slower now)")
+    print(f"{'case':>15} {'teams':>5} {'seasons':>7} {'cold':>8} {'warm':>8}")
+    for result in results['results']:
+        before = previous.get((result['case'], result['teams'], result['seasons']))
+        if before is None:
+            continue
+        print(f"{result['case']:>15} {result['teams']:>5} {result['seasons']:>7} "
+              f"{ratio(result, before, 'cold_ms'):>7.2f}x {ratio(result, before, 'warm_ms'):>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help="only the two smallest league sizes")
+    parser.add_argument('--output', help="where to write the JSON results")
+    parser.add_argument('--compare', help="earlier results JSON to compare timings against")
+    args = parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'repeats': REPEATS,
+        'results': []
+    }
+
+    print(f"{'case':>15} {'teams':>5} {'seasons':>7} {'cold ms':>9} {'warm ms':>9} {'peak KB':>9} {'blocks':>8}")
+    for n_teams, n_seasons in QUICK_LEAGUE_SIZES if args.quick else LEAGUE_SIZES:
+        league_id = n_teams * 100 + n_seasons
+        seasons = generate_league(
+            league_id=league_id, n_teams=n_teams, n_seasons=n_seasons, first_year=2025 - n_seasons,
+            roster_size=ROSTER_SIZE, seed=2024
+        )
+        install_league(seasons)
+
+        for name, case in CASES.items():
+            result = {'case': name, 'teams': n_teams, 'seasons': n_seasons, **measure(case, league_id, seasons)}
+            results['results'].append(result)
+            print(f"{name:>15} {n_teams:>5} {n_seasons:>7} {result['cold_ms']:>9.2f} {result['warm_ms']:>9.2f} "
+                  f"{result['peak_kb']:>9.1f} {result['allocated_blocks']:>8}")
+
+    output = args.output or os.path.join(REPO_DIR, 'benchmarks', 'results', f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(league_data.SNAPSHOT_DIR, ignore_errors=True)
@@ -0,0 +1,185 @@
+import pandas as pd
+
+from h2h import RECORD_TYPES, h2h_matrix_frame, h2h_readable_records
+from incremental import completed_weeks, refresh_all_time_stats, refresh_h2h
+from instrumentation import instrumented
+from league_data import load_season
+from players import season_player_index
+from playoffs import SEASON_SIMULATIONS, simulate_season
+from predictor import predict_matchup
+from shared_cache import is_empty, league_cache_for, ttl_for_years
+from standings import season_standings, standings_weeks_available
+
+# Called with every error message besides printing it: the dashboard sets st.error, so this
+# module (and everything it imports) stays usable without Streamlit
+on_error = None
+
+
+def report_error(message):
+    print(message)
+    if on_error is not None:
+        on_error(message)
+
+# Head to head 
+def get_all_time_h2h_arrays(league_id, start_year, end_year, espn_s2=None, swid=None, key='team'):
+    """
+    Integer-indexed H2H arrays for every record type, folding in only weeks completed since the last refresh.
+    key: 'team' (team_id, shown with the latest team name) or 'owner'
+    """
+    h2h, errors = refresh_h2h(league_id, start_year, end_year, espn_s2, swid, key=key)
+    
+    for year, error in errors:
+        report_error(f"Error processing {year}: {error}")
+    
+    return h2h
+
+def get_all_time_h2h_records(league_id, start_year, end_year, espn_s2=None, swid=None):
+    """Readable H2H records for all three record types: {'regular': ..., 'playoffs': ..., 'all': ...}"""
+    h2h = get_all_time_h2h_arrays(league_id, start_year, end_year, espn_s2, swid)
+    return {record_type: h2h_readable_records(h2h, record_type) for record_type in RECORD_TYPES}
+
+def get_all_time_h2h_by_scores_fixed(league_id, start_year, end_year, espn_s2=None, swid=None, record_type='all'):
+    """H2H records for one record_type: 'all', 'regular', 'playoffs'"""
+    h2h = get_all_time_h2h_arrays(league_id, start_year, end_year, espn_s2, swid)
+    return h2h_readable_records(h2h, record_type)
+
+def create_h2h_matrix(league_id, start_year, end_year, espn_s2=None, swid=None, record_type='all'):
+    """
+    Create the H2H matrix
+    record_type: 'all', 'regular', 'playoffs'
+    """
+    h2h = get_all_time_h2h_arrays(league_id, start_year, end_year, espn_s2, swid)
+    return h2h_matrix_frame(h2h, record_type)
+
+def create_h2h_matrices(league_id, start_year, end_year, espn_s2=None, swid=None):
+    """Create the 'regular', 'playoffs' and 'all' H2H matrices from a single pass over the seasons"""
+    h2h = get_all_time_h2h_arrays(league_id, start_year, end_year, espn_s2, swid)
+    return {record_type: h2h_matrix_frame(h2h, record_type) for record_type in RECORD_TYPES}
+
+def calculate_all_time_stats(league_id, start_year, end_year, espn_s2, swid):
+    """Calculate all-time statistics for all teams, separating regular season and playoffs"""
+    all_time_stats, errors = refresh_all_time_stats(league_id, start_year, end_year, espn_s2, swid)
+    
+    for year, error in errors:
+        print(f"Error loading year {year}: {error}")
+    
+    return all_time_stats
+
+def all_time_stats_key(league_id, start_year, end_year):
+    return ('all_time_stats', league_id, start_year, end_year)
+
+@instrumented('frame')
+def load_real_teams_data_full(league_id, year, espn_s2, swid):
+    """Load complete team data including players"""
+    try:
+        season = load_season(league_id, year, espn_s2, swid)
+        
+        teams_data = {}
+        
+        for team in season['teams']:
+            teams_data[team['owner']] = {
+                'total_points': team['points_for'],
+                'rank': team['standing'],
+                'wins': team['wins'],
+                'losses': team['losses'],
+                'ties': team['ties'],
+                'team_name': team['team_name'],
+                'players': pd.DataFrame(team['roster'])
+            }
+        
+        return teams_data
+        
+    except Exception as e:
+        report_error(f"Error loading team data: {str(e)}")
+        return {}
+
+def get_teams_data(league_id, year, espn_s2, swid):
+    """Team data for a year from the cache shared by all sessions, loading it on a miss"""
+    return league_cache_for(league_id).get_or_compute(
+        ('teams_data', league_id, year),
+        lambda: load_real_teams_data_full(league_id, year, espn_s2, swid),
+        ttl=ttl_for_years([year])
+    )
+
+def get_player_index(league_id, year, espn_s2, swid):
+    """Every rostered player for a year with position ranks (see players.build_player_index), built once per season load"""
+    return season_player_index(load_season(league_id, year, espn_s2, swid))
+
+def get_standings(league_id, year, espn_s2, swid, through_week=None):
+    """
+    (standings frame, completed regular season weeks) for a year. Standings are precomputed per
+    season snapshot and week (see standings.season_standings).
+    """
+    season = load_season(league_id, year, espn_s2, swid)
+    return season_standings(season, through_week), standings_weeks_available(season)
+
+def get_matchup_prediction(league_id, year, team_id, opponent_id, espn_s2, swid):
+    """A simulated matchup (see predictor.predict_matchup), cached per week and matchup for every session"""
+    season = load_season(league_id, year, espn_s2, swid)
+    return league_cache_for(league_id).get_or_compute(
+        ('matchup', league_id, year, season['current_week'], team_id, opponent_id),
+        lambda: predict_matchup(season, team_id, opponent_id),
+        ttl=ttl_for_years([year])
+    )
+
+def playoff_odds_key(league_id, year, weeks_done, simulations):
+    return ('playoff_odds', league_id, year, weeks_done, simulations)
+
+def get_playoff_odds(league_id, year, espn_s2, swid, simulations=SEASON_SIMULATIONS, workers=1):
+    """Simulated playoff odds (see playoffs.simulate_season), cached per completed week for every session"""
+    season = load_season(league_id, year, espn_s2, swid)
+    return league_cache_for(league_id).get_or_compute(
+        playoff_odds_key(league_id, year, completed_weeks(season), simulations),
+        lambda: simulate_season(season, simulations, workers=workers),
+        ttl=ttl_for_years([year])
+    )
+
+def h2h_matrix_key(league_id, start_year, end_year, record_type):
+    return ('h2h_matrix', league_id, start_year, end_year, record_type)
+
+def get_h2h_matrix(league_id, start_year, end_year, espn_s2, swid, record_type):
+    """An H2H matrix from the cache shared by all sessions, building all three record types on a miss"""
+    ttl = ttl_for_years(range(start_year, end_year + 1))
+    
+    def build():
+        h2h_matrices = create_h2h_matrices(league_id, start_year, end_year, espn_s2, swid)
+        # The same pass produced the other record types, so cache them as well
+        for other_type, other_matrix in h2h_matrices.items():
+            if other_type != record_type:
+                league_cache_for(league_id).set(h2h_matrix_key(league_id, start_year, end_year, other_type), other_matrix, ttl=ttl)
+        return h2h_matrices[record_type]
+    
+    return league_cache_for(league_id).get_or_compute(h2h_matrix_key(league_id, start_year, end_year, record_type), build, ttl=ttl)
+
+def warm_league_cache(season, espn_s2=None, swid=None):
+    """
+    Rebuild the shared cache entries a new snapshot of a season affects and swap them in, so pages
+    keep reading the previous results until the new ones are ready instead of recomputing on a miss.
+    """
+    league_id, year = season['league_id'], season['year']
+    league_cache = league_cache_for(league_id)
+    h2h_ranges = set()
+    
+    for key in league_cache.keys():
+        if key[:3] == ('teams_data', league_id, year):
+            teams_data = load_real_teams_data_full(league_id, year, espn_s2, swid)
+            if not is_empty(teams_data):
+                league_cache.set(key, teams_data, ttl=ttl_for_years([year]))
+        
+        elif key[0] == 'h2h_matrix' and key[1] == league_id and key[2] <= year <= key[3]:
+            h2h_ranges.add((key[2], key[3]))
+        
+        elif key[0] == 'all_time_stats' and key[1] == league_id and key[2] <= year <= key[3]:
+            start_year, end_year = key[2], key[3]
+            league_cache.set(key, calculate_all_time_stats(league_id, start_year, end_year, espn_s2, swid),
+                             ttl=ttl_for_years(range(start_year, end_year + 1)))
+    
+    # One pass rebuilds every record type for a range
+    for start_year, end_year in h2h_ranges:
+        h2h_matrices = create_h2h_matrices(league_id, start_year, end_year, espn_s2, swid)
+        for record_type, h2h_matrix in h2h_matrices.items():
+            league_cache.set(h2h_matrix_key(league_id, start_year, end_year, record_type), h2h_matrix,
+                             ttl=ttl_for_years(range(start_year, end_year + 1)))
+    
+    # Matchup simulations for the current week are cheap to redo from the new scores
+    league_cache.invalidate(lambda key: key[:3] == ('matchup', league_id, year))
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from instrumentation import STAGES, collect_stats, export_log, function_totals, recent_renders, reset
+
+
+def hit_rate(hits, misses):
+    lookups = hits + misses
+    return f"{hits / lookups * 100:.0f}%" if lookups else "-"
+
+
+def render(league_id, espn_s2, swid):
+    st.header("🔬 Diagnostics")
+    st.caption("Timings and counters for this server process, across every session.")
+
+    stats = collect_stats()
+    espn_requests = stats.get('espn_requests', {})
+    league_cache_stats = stats.get('league_cache', {})
+    table_stats = stats.get('season_tables', {})
+    season_loads = stats.get('season_loads', {})
+
+    # Counters since the process started
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("ESPN Requests", espn_requests.get('requests', 0),
+                  help=f"{espn_requests.get('coalesced', 0)} coalesced, {espn_requests.get('retries', 0)} retries")
+    with col2:
+        st.metric("Shared Cache Hit Rate", hit_rate(league_cache_stats.get('hits', 0), league_cache_stats.get('misses', 0)),
+                  help=f"{league_cache_stats.get('entries', 0)} entries")
+    with col3:
+        st.metric("Season Table Hit Rate", hit_rate(table_stats.get('hits', 0), table_stats.get('misses', 0)))
+    with col4:
+        loads = sum(season_loads.values())
+        st.metric("Seasons From Memory", hit_rate(season_loads.get('memory', 0), loads - season_loads.get('memory', 0)),
+                  help=f"{season_loads.get('disk', 0)} from snapshot files, {season_loads.get('espn', 0)} from ESPN")
+
+    # Recent renders split by stage
+    st.subheader("Recent Page Renders")
+    renders = recent_renders()
+    if renders:
+        rows = []
+        for page_render in renders:
+            render_stats = page_render.get('stats', {})
+            cache = render_stats.get('league_cache', {})
+            rows.append({
+                'Time': datetime.fromtimestamp(page_render['started_at']).strftime("%H:%M:%S"),
+                'Page': page_render['page'],
+                'Total ms': round(page_render['total_ms']),
+                **{f"{stage.title()} ms": round(page_render['stages'].get(stage, 0)) for stage in STAGES},
+                'ESPN Requests': render_stats.get('espn_requests', {}).get('requests', 0),
+                'Cache Hits': cache.get('hits', 0),
+                'Cache Misses': cache.get('misses', 0)
+            })
+        renders_df = pd.DataFrame(rows)
+        st.dataframe(renders_df, use_container_width=True, hide_index=True)
+
+        chart_df = renders_df.reset_index().melt(
+            id_vars=['index', 'Page'], value_vars=[f"{stage.title()} ms" for stage in STAGES],
+            var_name='Stage', value_name='ms'
+        )
+        chart_df['Render'] = chart_df['index'].astype(str) + " " + chart_df['Page']
+        fig = px.bar(chart_df, x='Render', y='ms', color='Stage', title='Where each render spent its time (most recent first)')
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.download_button(
+            "Download renders (CSV)", renders_df.to_csv(index=False),
+            file_name="ffa_renders.csv", mime="text/csv"
+        )
+    else:
+        st.info("No page renders recorded yet.")
+
+    # Per function timings
+    st.subheader("Timed Functions")
+    functions = function_totals()
+    if functions:
+        st.dataframe(pd.DataFrame(functions), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Download full log (JSON)", export_log(),
+            file_name=f"ffa_diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", mime="application/json"
+        )
+    with col2:
+        if st.button("Reset timings"):
+            reset()
+            st.rerun()
@@ -0,0 +1,200 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import get_h2h_matrix, h2h_matrix_key
+from h2h import RECORD_TYPES
+from shared_cache import league_cache_for
+
+
+def render(league_id, espn_s2, swid):
+    # League configuration in sidebar (for H2H Matrix)
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("League Configuration")
+    
+    start_year = st.sidebar.number_input("Start Year", value=2019, min_value=2000, max_value=2099)
+    end_year = st.sidebar.number_input("End Year", value=2024, min_value=2000, max_value=2099)
+    
+    st.header("🏆 Head-to-Head Matrix")
+    
+    # Instructions
+    st.info("📖 **How to read**: Row team's record vs Column team. Format: Wins-Losses")
+    
+    
+    # Add toggle for regular season vs playoffs
+    col1, col2 = st.columns(2)
+    with col1:
+        matrix_type = st.radio(
+            "Select Records Type:",
+            ["Regular Season Only", "Playoffs Only", "All Games", "All Three Views"]
+        )
+    
+    # Generate matrices based on selection
+    if matrix_type == "All Three Views":
+        # Generate all three matrices
+        h2h_matrices = {
+            record_type: league_cache_for(league_id).get(h2h_matrix_key(league_id, start_year, end_year, record_type))
+            for record_type in RECORD_TYPES
+        }
+        
+        # One pass over the seasons builds all three matrices
+        if any(h2h_matrix is None for h2h_matrix in h2h_matrices.values()):
+            with st.spinner("Processing regular season, playoffs and all games data..."):
+                try:
+                    h2h_matrices = {
+                        record_type: get_h2h_matrix(league_id, start_year, end_year, espn_s2, swid, record_type)
+                        for record_type in RECORD_TYPES
+                    }
+                except Exception as e:
+                    st.error(f"Error generating matrices: {e}")
+        
+        # Display all three matrices
+        if all(h2h_matrix is not None for h2h_matrix in h2h_matrices.values()):
+            # First row - Regular Season and Playoffs side by side
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Regular Season Only")
+                h2h_matrix_reg = h2h_matrices['regular']
+                
+                def style_matrix(val):
+                    if val == "-":
+                        return 'background-color: #f0f0f0; text-align: center; font-weight: bold'
+                    else:
+                        return 'text-align: center; font-weight: bold; font-size: 10px'
+                
+                styled_matrix_reg = h2h_matrix_reg.style.applymap(style_matrix)
+                st.dataframe(styled_matrix_reg, use_container_width=True, height=350)
+            
+            with col2:
+                st.subheader("Playoffs Only")
+                h2h_matrix_playoff = h2h_matrices['playoffs']
+                styled_matrix_playoff = h2h_matrix_playoff.style.applymap(style_matrix)
+                st.dataframe(styled_matrix_playoff, use_container_width=True, height=350)
+            
+            # Second row - All Games centered
+            st.subheader("All Games Combined")
+            h2h_matrix_all = h2h_matrices['all']
+            styled_matrix_all = h2h_matrix_all.style.applymap(style_matrix)
+            st.dataframe(styled_matrix_all, use_container_width=True, height=350)
+    
+    else:
+        # Single matrix view
+        if matrix_type == "Regular Season Only":
+            record_type = 'regular'
+        elif matrix_type == "Playoffs Only":
+            record_type = 'playoffs'
+        else:  # All Games
+            record_type = 'all'
+            
+        h2h_matrix = league_cache_for(league_id).get(h2h_matrix_key(league_id, start_year, end_year, record_type))
+        
+        if h2h_matrix is None:
+            with st.spinner(f"Processing {matrix_type.lower()} data... This may take a few minutes..."):
+                try:
+                    h2h_matrix = get_h2h_matrix(league_id, start_year, end_year, espn_s2, swid, record_type)
+                    st.success("Matrix generated successfully!")
+                except Exception as e:
+                    st.error(f"Error generating matrix: {e}")
+                    st.info("Make sure you have the correct league ID and credentials (if private league)")
+        
+        # Display matrix if it was loaded
+        if h2h_matrix is not None:
+            
+            # Full matrix display
+            st.subheader(f"Complete Head-to-Head Matrix - {matrix_type}")
+            
+            # Style the matrix for better visibility
+            def style_matrix(val):
+                if val == "-":
+                    return 'background-color: #f0f0f0; text-align: center; font-weight: bold'
+                else:
+                    return 'text-align: center; font-weight: bold'
+            
+            styled_matrix = h2h_matrix.style.applymap(style_matrix)
+            st.dataframe(styled_matrix, use_container_width=True)
+            
+            st.markdown("---")
+            
+            # Individual team filter
+            st.subheader(f"Individual Team Records - {matrix_type}")
+            
+            # Team selector
+            teams = list(h2h_matrix.index)
+            selected_team = st.selectbox("Select a team to view their record:", teams)
+            
+            if selected_team:
+                # Get the selected team's row
+                team_record = h2h_matrix.loc[selected_team]
+                
+                # Create a dataframe for better display
+                record_df = pd.DataFrame({
+                    'Opponent': team_record.index,
+                    'Record (W-L)': team_record.values
+                })
+                
+                # Remove the self-matchup row
+                record_df = record_df[record_df['Record (W-L)'] != '-']
+                
+                # Calculate totals
+                total_wins = 0
+                total_losses = 0
+                total_games = 0
+                
+                for record in record_df['Record (W-L)']:
+                    if '-' in record and record != '-':
+                        try:
+                            wins, losses = record.split('-')
+                            total_wins += int(wins)
+                            total_losses += int(losses)
+                            total_games += int(wins) + int(losses)
+                        except:
+                            continue
+                
+                # Display metrics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total Wins", total_wins)
+                with col2:
+                    st.metric("Total Losses", total_losses)
+                with col3:
+                    st.metric("Total Games", total_games)
+                with col4:
+                    win_pct = (total_wins / total_games * 100) if total_games > 0 else 0
+                    st.metric("Win %", f"{win_pct:.1f}%")
+                
+                # Display the individual records
+                st.dataframe(record_df, use_container_width=True, hide_index=True)
+                
+                # Create a bar chart of wins vs losses for each opponent
+                wins_data = []
+                losses_data = []
+                opponents = []
+                
+                for _, row in record_df.iterrows():
+                    opponent = row['Opponent']
+                    record = row['Record (W-L)']
+                    if '-' in record:
+                        try:
+                            wins, losses = record.split('-')
+                            wins_data.append(int(wins))
+                            losses_data.append(int(losses))
+                            opponents.append(opponent)
+                        except:
+                            continue
+                
+                if opponents:
+                    chart_df = pd.DataFrame({
+                        'Opponent': opponents + opponents,
+                        'Count': wins_data + losses_data,
+                        'Type': ['Wins'] * len(opponents) + ['Losses'] * len(opponents)
+                    })
+                    
+                    fig = px.bar(chart_df, x='Opponent', y='Count', color='Type',
+                                title=f'{selected_team} - Wins vs Losses by Opponent ({matrix_type})',
+                                barmode='group')
+                    fig.update_layout(xaxis_tickangle=45)
+                    st.plotly_chart(fig, use_container_width=True)
+        
+        else:
+            st.info("Matrix generation failed - check your league configuration")
@@ -0,0 +1,89 @@
+import time
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import get_matchup_prediction
+from league_data import load_season
+from predictor import lineup_comparison_frame
+
+
+def render(league_id, espn_s2, swid):
+    st.header("🔮 Matchup Predictor")
+    
+    season = None
+    with st.spinner("Loading league data..."):
+        for year_to_try in [2024, 2023]:
+            try:
+                season = load_season(league_id, year_to_try, espn_s2, swid)
+                break
+            except Exception:
+                continue
+    
+    if season is None or not season['teams']:
+        st.error("Could not load team data.")
+        st.stop()
+    
+    teams = {team['team_id']: team for team in season['teams']}
+    team_ids = list(teams)
+    
+    def team_label(team_id):
+        return f"{teams[team_id]['team_name']} ({teams[team_id]['owner']})"
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Your Team")
+        team_id = st.selectbox("Select your team:", team_ids, format_func=team_label)
+    
+    with col2:
+        st.subheader("Opponent")
+        # Default to this week's scheduled opponent
+        opponent_ids = [other_id for other_id in team_ids if other_id != team_id]
+        week_index = season['current_week'] - 1
+        schedule = teams[team_id]['schedule']
+        scheduled = schedule[week_index] if 0 <= week_index < len(schedule) else None
+        default = opponent_ids.index(scheduled) if scheduled in opponent_ids else 0
+        opponent_id = st.selectbox("Select opponent:", opponent_ids, index=default, format_func=team_label)
+    
+    sim_start = time.perf_counter()
+    prediction = get_matchup_prediction(league_id, season['year'], team_id, opponent_id, espn_s2, swid)
+    sim_ms = (time.perf_counter() - sim_start) * 1000
+    
+    (low, median, high), (opp_low, opp_median, opp_high) = prediction['score_percentiles']
+    
+    with col1:
+        st.write(f"Projected Points: **{prediction['mean_scores'][0]:.1f}**")
+        st.write(f"80% Range: **{low:.1f} - {high:.1f}**")
+        st.write(f"Win Probability: **{prediction['win_probability']:.0%}**")
+    
+    with col2:
+        st.write(f"Projected Points: **{prediction['mean_scores'][1]:.1f}**")
+        st.write(f"80% Range: **{opp_low:.1f} - {opp_high:.1f}**")
+        st.write(f"Win Probability: **{prediction['opponent_win_probability']:.0%}**")
+    
+    st.caption(
+        f"{season['year']} week {prediction['week']}: {prediction['simulations']:,} simulated games "
+        f"({sim_ms:.0f} ms). Scores blend each team's results so far with its projected lineup."
+    )
+    
+    # Score distributions from the simulations
+    bins = prediction['histogram']['bins']
+    centers = [(left + right) / 2 for left, right in zip(bins[:-1], bins[1:])]
+    distribution = pd.DataFrame({
+        'Points': centers * 2,
+        'Simulations': prediction['histogram']['counts'][0] + prediction['histogram']['counts'][1],
+        'Team': [teams[team_id]['team_name']] * len(centers) + [teams[opponent_id]['team_name']] * len(centers)
+    })
+    fig_distribution = px.line(distribution, x='Points', y='Simulations', color='Team',
+                               title='Simulated Score Distribution')
+    st.plotly_chart(fig_distribution, use_container_width=True)
+    
+    # Matchup visualization
+    matchup_data = lineup_comparison_frame(prediction)
+    
+    fig = px.bar(matchup_data, x='Position', y=['Your_Team', 'Opponent'],
+                 title='Position-by-Position Matchup Projection',
+                 barmode='group')
+    st.plotly_chart(fig, use_container_width=True)
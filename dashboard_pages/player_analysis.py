@@ -0,0 +1,83 @@
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import get_player_index
+
+
+def render(league_id, espn_s2, swid):
+    st.header("👤 Player Analysis")
+    
+    
+    player_index = None
+    
+    with st.spinner("Loading player data..."):
+        for year_to_try in [2024, 2023]:
+            try:
+                player_index = get_player_index(league_id, year_to_try, espn_s2, swid)
+                
+                if player_index['by_id']:
+                    break
+            except:
+                continue
+        
+        if player_index is None:
+            st.error("Could not load team data.")
+            st.stop()
+    
+    players_by_id = player_index['by_id']
+    if not players_by_id:
+        st.warning("No player data available.")
+        st.stop()
+    
+    # Player selector - options are player ids, so players sharing a name stay distinct
+    selected_player_id = st.selectbox(
+        "Select a player:", list(players_by_id),
+        format_func=lambda player_id: players_by_id[player_id]['Label']
+    )
+    selected_player_data = players_by_id[selected_player_id]
+    
+    # Display player info
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Position", selected_player_data['Position'])
+    with col2:
+        st.metric("Total Points", f"{selected_player_data['Points']:.1f}")
+    with col3:
+        st.metric("Avg Points", f"{selected_player_data['Avg Points']:.1f}")
+    with col4:
+        st.metric("Pro Team", selected_player_data['Pro Team'])
+    
+    # Additional player info
+    col5, col6 = st.columns(2)
+    with col5:
+        st.metric("Owner", selected_player_data['Owner'])
+    with col6:
+        st.metric("Injury Status", selected_player_data['Injury Status'])
+    
+    # Position rank among every rostered player at the position
+    same_position_players = player_index['by_position'][selected_player_data['Position']]
+    st.metric(
+        "Position Rank",
+        f"#{selected_player_data['Position Rank']} of {len(same_position_players)}",
+        f"{selected_player_data['Position Percentile']:.0f}th percentile",
+        delta_color="off"
+    )
+    
+    # Position comparison chart
+    st.subheader("Position Comparison")
+    
+    if len(same_position_players) > 1:
+        # Already sorted by points when the index was built
+        fig_comparison = px.bar(same_position_players, 
+                               x='Label', y='Points',
+                               labels={'Label': 'Player'},
+                               title=f'{selected_player_data["Position"]} Rankings by Total Points',
+                               color='Points',
+                               hover_data=['Owner', 'Avg Points'])
+        fig_comparison.update_layout(xaxis_tickangle=45)
+        st.plotly_chart(fig_comparison, use_container_width=True)
+    
+    # League-wide position analysis
+    st.subheader("League Position Analysis")
+    
+    st.dataframe(player_index['position_stats'], use_container_width=True)
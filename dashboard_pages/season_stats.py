@@ -0,0 +1,64 @@
+import os
+
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import get_playoff_odds, get_standings
+
+
+def render(league_id, espn_s2, swid):
+    st.header("📈 Season Statistics")
+    
+    available_years = list(range(2019, 2025))
+    selected_year = st.selectbox("Select Year:", available_years, index=len(available_years)-1)
+    
+    try:
+        with st.spinner(f"Loading {selected_year} standings..."):
+            standings, weeks_available = get_standings(league_id, selected_year, espn_s2, swid)
+    except Exception as e:
+        st.error(f"Error loading data for {selected_year}: {e}")
+        st.stop()
+    
+    if weeks_available == 0:
+        st.info(f"No completed weeks in {selected_year} yet.")
+        st.stop()
+    
+    # Standings as of any completed week - each week's table is precomputed once
+    through_week = weeks_available
+    if weeks_available > 1:
+        through_week = st.slider("Standings through week:", 1, weeks_available, weeks_available)
+        if through_week != weeks_available:
+            standings, _ = get_standings(league_id, selected_year, espn_s2, swid, through_week)
+    
+    # League standings table
+    st.subheader("League Standings")
+    st.caption("Regular season only. Ties in win % are broken by head-to-head record, then points for.")
+    st.dataframe(standings, use_container_width=True, hide_index=True)
+    
+    # Points distribution
+    st.subheader("Points Distribution")
+    fig = px.histogram(standings, x='Points For', nbins=10,
+                      title='League Points Distribution')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Points for vs against
+    fig_scatter = px.scatter(standings, x='Points For', y='Points Against', text='Team',
+                            color='Win %', title='Points For vs Points Against')
+    fig_scatter.update_traces(textposition='top center')
+    st.plotly_chart(fig_scatter, use_container_width=True)
+    
+    # Playoff odds from simulating the rest of the season
+    st.subheader("🏆 Playoff Odds")
+    simulations = st.select_slider("Simulated seasons:", options=[10_000, 100_000, 1_000_000], value=100_000)
+    if st.toggle("Simulate playoff odds"):
+        with st.spinner(f"Simulating {simulations:,} seasons..."):
+            # Larger runs are split across worker processes
+            workers = (os.cpu_count() or 1) if simulations >= 1_000_000 else 1
+            playoff_odds = get_playoff_odds(league_id, selected_year, espn_s2, swid, simulations, workers)
+        
+        st.caption("Remaining regular season and playoff games are simulated; seeding uses wins, then points for.")
+        st.dataframe(playoff_odds, use_container_width=True, hide_index=True)
+        
+        fig_odds = px.bar(playoff_odds, x='Team', y=['Playoffs %', 'Bye %', 'Championship %'],
+                          title='Playoff Odds', barmode='group')
+        st.plotly_chart(fig_odds, use_container_width=True)
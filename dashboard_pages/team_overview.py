@@ -0,0 +1,217 @@
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import all_time_stats_key, calculate_all_time_stats, get_teams_data
+from shared_cache import league_cache_for, ttl_for_years
+
+
+def render_all_time_stats(all_time_stats, selected_owner):
+    """All-time regular season and playoff metrics for one owner, compared to the league average"""
+    if selected_owner in all_time_stats:
+        owner_all_time = all_time_stats[selected_owner]
+        
+        # Calculate league averages for regular season
+        total_owners = len(all_time_stats)
+        league_avg_reg_points = sum(s['regular_season']['total_points'] for s in all_time_stats.values()) / total_owners if total_owners > 0 else 0
+        league_avg_reg_wins = sum(s['regular_season']['wins'] for s in all_time_stats.values()) / total_owners if total_owners > 0 else 0
+        league_avg_reg_losses = sum(s['regular_season']['losses'] for s in all_time_stats.values()) / total_owners if total_owners > 0 else 0
+        league_avg_reg_win_pct = (league_avg_reg_wins / (league_avg_reg_wins + league_avg_reg_losses) * 100) if (league_avg_reg_wins + league_avg_reg_losses) > 0 else 0
+        
+        # REGULAR SEASON STATS
+        st.write("**Regular Season**")
+        
+        # Calculate owner regular season stats
+        owner_reg_games = owner_all_time['regular_season']['wins'] + owner_all_time['regular_season']['losses']
+        owner_reg_win_pct = (owner_all_time['regular_season']['wins'] / owner_reg_games * 100) if owner_reg_games > 0 else 0
+        
+        # Differences from league average
+        reg_points_diff = owner_all_time['regular_season']['total_points'] - league_avg_reg_points
+        reg_points_diff_pct = (reg_points_diff / league_avg_reg_points * 100) if league_avg_reg_points > 0 else 0
+        reg_wins_diff = owner_all_time['regular_season']['wins'] - league_avg_reg_wins
+        reg_win_pct_diff = owner_reg_win_pct - league_avg_reg_win_pct
+        
+        # Display regular season metrics
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "Regular Season Points", 
+                f"{owner_all_time['regular_season']['total_points']:.1f}",
+                f"{reg_points_diff:+.1f} ({reg_points_diff_pct:+.1f}% vs avg)"
+            )
+        
+        with col2:
+            reg_record_str = f"{owner_all_time['regular_season']['wins']}-{owner_all_time['regular_season']['losses']}"
+            if owner_all_time['regular_season']['ties'] > 0:
+                reg_record_str += f"-{owner_all_time['regular_season']['ties']}"
+            st.metric(
+                "Regular Season Record", 
+                reg_record_str,
+                f"{reg_wins_diff:+.0f} wins vs avg"
+            )
+        
+        with col3:
+            st.metric(
+                "Regular Season Win %", 
+                f"{owner_reg_win_pct:.1f}%",
+                f"{reg_win_pct_diff:+.1f}% vs avg"
+            )
+        
+        # PLAYOFF STATS
+        st.write("**Playoffs**")
+        
+        # Calculate playoff win percentage
+        playoff_games = owner_all_time['playoffs']['wins'] + owner_all_time['playoffs']['losses']
+        owner_playoff_win_pct = (owner_all_time['playoffs']['wins'] / playoff_games * 100) if playoff_games > 0 else 0
+        
+        # Display playoff metrics
+        col4, col5, col6 = st.columns(3)
+        
+        with col4:
+            st.metric(
+                "Playoff Appearances", 
+                f"{owner_all_time['playoffs']['appearances']}"
+            )
+        
+        with col5:
+            playoff_record_str = f"{owner_all_time['playoffs']['wins']}-{owner_all_time['playoffs']['losses']}"
+            if owner_all_time['playoffs']['ties'] > 0:
+                playoff_record_str += f"-{owner_all_time['playoffs']['ties']}"
+            st.metric(
+                "Playoff Record", 
+                playoff_record_str
+            )
+        
+        with col6:
+            st.metric(
+                "Playoff Win %", 
+                f"{owner_playoff_win_pct:.1f}%" if playoff_games > 0 else "N/A"
+            )
+        
+        # Combined total points
+        total_all_time_points = owner_all_time['regular_season']['total_points'] + owner_all_time['playoffs']['total_points']
+        
+        # Years played and total points
+        col7, col8 = st.columns(2)
+        with col7:
+            st.info(f"Years in league: {owner_all_time['years_played']}")
+        with col8:
+            st.info(f"Total All-Time Points (Reg + Playoffs): {total_all_time_points:.1f}")
+    else:
+        st.warning(f"No all-time data available for {selected_owner}")
+
+def render(league_id, espn_s2, swid):
+    st.header("Team Overview")
+    
+    # Load initial data for team selector
+    initial_teams_data = league_cache_for(league_id).get(('teams_data', league_id, 2024))
+    
+    if not initial_teams_data:
+        with st.spinner("Loading team data..."):
+            # Try to load most recent year for team list
+            for year_to_try in [2024, 2023]:
+                try:
+                    initial_teams_data = get_teams_data(league_id, year_to_try, espn_s2, swid)
+                    if initial_teams_data:
+                        break
+                except:
+                    continue
+            
+            if not initial_teams_data:
+                st.error("Could not load team data. Please check your league credentials.")
+                st.stop()
+    
+    # Team selector at the top
+    owner_options = []
+    for owner, data in initial_teams_data.items():
+        owner_options.append(f"{owner}")
+    
+    selected_option = st.selectbox("Select a team:", owner_options)
+    selected_owner = selected_option.split(' - ')[0]
+    
+    # ALL-TIME STATS SECTION
+    st.subheader("📊 All-Time Stats (2019-2024)")
+    
+    # All-time stats walk six seasons, so only compute them once the section is switched on
+    all_time_stats = league_cache_for(league_id).get(all_time_stats_key(league_id, 2019, 2024))
+    
+    if st.toggle("Show all-time stats", value=all_time_stats is not None):
+        if all_time_stats is None:
+            with st.spinner("Calculating all-time statistics..."):
+                all_time_stats = league_cache_for(league_id).get_or_compute(
+                    all_time_stats_key(league_id, 2019, 2024),
+                    lambda: calculate_all_time_stats(league_id, 2019, 2024, espn_s2, swid),
+                    ttl=ttl_for_years(range(2019, 2025))
+                )
+        
+        render_all_time_stats(all_time_stats, selected_owner)
+    
+    st.markdown("---")
+    
+    # YEAR SELECTOR 
+    available_years = list(range(2019, 2025))  
+    selected_year = st.selectbox("Select Year for Individual Stats:", available_years, index=len(available_years)-1)
+    
+    # Load data for selected year
+    year_data = league_cache_for(league_id).get(('teams_data', league_id, selected_year))
+    if year_data is None:
+        with st.spinner(f"Loading {selected_year} data..."):
+            try:
+                year_data = get_teams_data(league_id, selected_year, espn_s2, swid)
+                if not year_data:
+                    st.error(f"No data available for {selected_year}")
+                    year_data = {}
+            except Exception as e:
+                st.error(f"Error loading data for {selected_year}: {e}")
+                year_data = {}
+    
+    # INDIVIDUAL YEAR STATS SECTION
+    st.subheader(f"📅 {selected_year} Season Stats")
+    
+    if year_data and selected_owner in year_data:
+        team_data_dict = year_data[selected_owner]
+        
+        # Display team info
+        st.write(f"**Team Name:** {team_data_dict['team_name']}")
+        st.write(f"**Owner:** {selected_owner}")
+        
+        # Team metrics for selected year
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Points", f"{team_data_dict['total_points']:.1f}")
+        with col2:
+            st.metric("Current Rank", f"#{team_data_dict['rank']}")
+        with col3:
+            record = f"{team_data_dict['wins']}-{team_data_dict['losses']}"
+            if team_data_dict['ties'] > 0:
+                record += f"-{team_data_dict['ties']}"
+            st.metric("Record", record)
+        with col4:
+            win_pct = team_data_dict['wins'] / (team_data_dict['wins'] + team_data_dict['losses']) * 100 if (team_data_dict['wins'] + team_data_dict['losses']) > 0 else 0
+            st.metric("Win %", f"{win_pct:.1f}%")
+        
+        # Display roster if available
+        if not team_data_dict['players'].empty:
+            st.subheader(f"{selected_year} Roster")
+            
+            # Sort players by total points
+            roster_df = team_data_dict['players'].sort_values('Points', ascending=False)
+            
+            # Format the dataframe for display
+            display_df = roster_df[['Player', 'Position', 'Pro Team', 'Points', 'Avg Points']].copy()
+            display_df['Points'] = display_df['Points'].round(1)
+            display_df['Avg Points'] = display_df['Avg Points'].round(1)
+            
+            st.dataframe(display_df, use_container_width=True, hide_index=True)
+            
+            # Position breakdown
+            st.subheader(f"Points by Position - {selected_year}")
+            position_points = roster_df.groupby('Position')['Points'].sum().sort_values(ascending=False)
+            
+            fig = px.bar(x=position_points.index, y=position_points.values,
+                        labels={'x': 'Position', 'y': 'Total Points'},
+                        title=f"Total Points by Position - {team_data_dict['team_name']} ({selected_year})")
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning(f"No data available for {selected_owner} in {selected_year}")
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from espn_api.football import League
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.espn_requests import ESPNAccessDenied, EspnFantasyRequests
+
+from instrumentation import instrumented, register_stats
+
+# Point at a local stub server (or a proxy) instead of ESPN
+ESPN_BASE_URL = os.environ.get('FFA_ESPN_BASE_URL', FANTASY_BASE_ENDPOINT)
+# 'live' talks to ESPN, 'record' also saves every league payload as a fixture, 'replay' only serves fixtures
+ESPN_MODE = os.environ.get('FFA_ESPN_MODE', 'live')
+# Recorded payloads, one file per request under <league_id>/<year>/
+FIXTURE_DIR = os.environ.get(
+    'FFA_FIXTURE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'espn_fixtures')
+)
+# Keep-alive connections kept per host
+POOL_SIZE = 16
+# Retries after the first attempt, and the first backoff (seconds, doubled each retry)
+RETRIES = 3
+BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Seconds to wait for ESPN to connect / send a response
+REQUEST_TIMEOUT = 30
+
+_session = None
+_session_lock = threading.Lock()
+
+# Requests on the wire, keyed by request -> {'done', 'response', 'error'}
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Counters for this process: upstream requests sent, callers that shared one, retries
+request_stats = {'requests': 0, 'coalesced': 0, 'retries': 0}
+_stats_lock = threading.Lock()
+
+
+class FixtureMissing(Exception):
+    """Replay mode was asked for a request that was never recorded"""
+
+
+class FetchedResponse:
+    """The parts of a response espn_api uses. Shared between coalesced callers, so json() parses a fresh copy each call."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def get_session():
+    """The process-wide keep-alive session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def _count(stat):
+    with _stats_lock:
+        request_stats[stat] += 1
+
+def get_request_stats():
+    with _stats_lock:
+        return dict(request_stats)
+
+def get_with_retry(url, params=None, headers=None, cookies=None):
+    """GET through the pooled session, retrying connection errors and 429/5xx with exponential backoff"""
+    for attempt in range(RETRIES + 1):
+        delay = BACKOFF * 2 ** attempt
+        try:
+            _count('requests')
+            r = get_session().get(url, params=params, headers=headers, cookies=cookies, timeout=REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == RETRIES:
+                raise
+        else:
+            if r.status_code not in RETRY_STATUSES or attempt == RETRIES:
+                return FetchedResponse(r.status_code, r.content)
+            # Respect the server's Retry-After when it gives one in seconds
+            retry_after = r.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+
+        _count('retries')
+        time.sleep(delay)
+
+def coalesced_get(url, params=None, headers=None, cookies=None):
+    """
+    GET with single-flight coalescing: callers asking for the same request while it is on the
+    wire wait for it and share its response instead of sending their own.
+    """
+    key = json.dumps([url, params, headers, cookies], sort_keys=True, default=str)
+    with _in_flight_lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = {'done': threading.Event(), 'response': None, 'error': None}
+
+    if not leader:
+        _count('coalesced')
+        flight['done'].wait()
+        if flight['error'] is not None:
+            raise flight['error']
+        return flight['response']
+
+    try:
+        flight['response'] = get_with_retry(url, params, headers, cookies)
+        return flight['response']
+    except Exception as e:
+        flight['error'] = e
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        flight['done'].set()
+
+def fixture_path(league_id, year, path, params=None, headers=None):
+    """
+    Where a request's payload is recorded. Only the path below the base URL, params and headers
+    identify it - not the host or cookies - so fixtures replay without credentials.
+    """
+    key = json.dumps([path, params, headers], sort_keys=True, default=str)
+    name = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return os.path.join(FIXTURE_DIR, str(league_id), str(year), f"{name}.json")
+
+def read_fixture(path):
+    try:
+        with open(path) as f:
+            fixture = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return FetchedResponse(fixture['status_code'], fixture['body'].encode())
+
+def write_fixture(path, request_path, params, headers, response):
+    """Save a recorded response atomically, with the request it answers for reference"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fixture = {
+        'path': request_path,
+        'params': params,
+        'headers': headers,
+        'status_code': response.status_code,
+        'body': response.content.decode()
+    }
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(fixture, f)
+    os.replace(tmp_path, path)
+
+
+class PooledEspnRequests(EspnFantasyRequests):
+    """espn_api's request layer sending league requests through fetch: pooled and coalesced, optionally recorded or replayed"""
+
+    def __init__(self, *args, base_url=ESPN_BASE_URL, mode=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.base_url = base_url
+        self.mode = mode or ESPN_MODE
+        self.ENDPOINT = self.ENDPOINT.replace(FANTASY_BASE_ENDPOINT, base_url)
+        self.LEAGUE_ENDPOINT = self.LEAGUE_ENDPOINT.replace(FANTASY_BASE_ENDPOINT, base_url)
+
+    def fetch(self, endpoint, params=None, headers=None):
+        """One GET, live, recorded or replayed depending on the mode"""
+        if self.mode == 'live':
+            return coalesced_get(endpoint, params=params, headers=headers, cookies=self.cookies)
+
+        request_path = endpoint[len(self.base_url):] if endpoint.startswith(self.base_url) else endpoint
+        path = fixture_path(self.league_id, self.year, request_path, params, headers)
+        if self.mode == 'replay':
+            r = read_fixture(path)
+            if r is None:
+                raise FixtureMissing(f"No recorded ESPN response for {request_path} (league {self.league_id}, {self.year})")
+            return r
+
+        r = coalesced_get(endpoint, params=params, headers=headers, cookies=self.cookies)
+        write_fixture(path, request_path, params, headers, r)
+        return r
+
+    def alternate_league_endpoint(self):
+        """ESPN keeps some seasons under leagueHistory and others under seasons - the one not tried yet"""
+        if "/leagueHistory/" in self.LEAGUE_ENDPOINT:
+            base_endpoint = self.LEAGUE_ENDPOINT.split("/leagueHistory/")[0]
+            return f"{base_endpoint}/seasons/{self.year}/segments/0/leagues/{self.league_id}"
+        base_endpoint = self.LEAGUE_ENDPOINT.split("/seasons/")[0]
+        return f"{base_endpoint}/leagueHistory/{self.league_id}?seasonId={self.year}"
+
+    def league_get(self, params=None, headers=None, extend=""):
+        endpoint = self.LEAGUE_ENDPOINT + extend
+        r = self.fetch(endpoint, params=params, headers=headers)
+
+        if r.status_code == 401:
+            # Same fallback as espn_api, but through this layer so it is pooled and recorded too
+            alternate_endpoint = self.alternate_league_endpoint()
+            alternate = self.fetch(alternate_endpoint + extend, params=params, headers=headers)
+            if alternate.status_code != 200:
+                if not self.cookies or "espn_s2" not in self.cookies or "SWID" not in self.cookies:
+                    raise ESPNAccessDenied("espn_s2 and swid are required")
+                raise ESPNAccessDenied(f"League {self.league_id} cannot be accessed with the provided credentials")
+            self.LEAGUE_ENDPOINT = alternate_endpoint
+            response = alternate.json()
+        else:
+            # Raises for other errors, or stands in for the body (e.g. a missing message board)
+            response = self.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers) or r.json()
+
+        if self.logger:
+            self.logger.log_request(endpoint=self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, response=response)
+
+        return response[0] if isinstance(response, list) else response
+
+    def get(self, params=None, headers=None, extend=""):
+        endpoint = self.ENDPOINT + extend
+        r = self.fetch(endpoint, params=params, headers=headers)
+        if r.status_code == 404:
+            return self.checkRequestStatus(r.status_code, extend=extend)
+        self.checkRequestStatus(r.status_code)
+
+        response = r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=response)
+        return response
+
+
+@instrumented('fetch')
+def pooled_league(league_id, year, espn_s2=None, swid=None, mode=None):
+    """An espn_api League fetched through the pooled, coalescing request layer (see ESPN_MODE for mode)"""
+    league = League(league_id, year, espn_s2=espn_s2, swid=swid, fetch_league=False)
+    league.espn_request = PooledEspnRequests(
+        sport='nfl', year=year, league_id=league_id,
+        cookies=league.espn_request.cookies, logger=league.logger, mode=mode
+    )
+    league.fetch_league()
+    return league
+
+def record_seasons(league_id, years, espn_s2=None, swid=None):
+    """Fetch seasons from ESPN and save every payload behind them as fixtures. Returns [(year, error)]."""
+    errors = []
+    for year in years:
+        try:
+            pooled_league(league_id, year, espn_s2, swid, mode='record')
+        except Exception as e:
+            print(f"Could not record {year}: {e}")
+            errors.append((year, e))
+    return errors
+
+
+register_stats('espn_requests', get_request_stats)
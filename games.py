@@ -0,0 +1,140 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import instrumented, register_stats
+from league_data import get_playoff_start_week
+
+# One row per matchup. team1 is the lower team_id; a bye is a team listed against itself.
+GAME_COLUMNS = [
+    'year', 'week', 'is_playoff', 'is_bye',
+    'team1_id', 'team1_owner', 'team1_score',
+    'team2_id', 'team2_owner', 'team2_score'
+]
+
+# Tables already built in this process, keyed by (league_id, year) -> (fetched_at, {name: table})
+_games_cache = {}
+_games_cache_lock = threading.Lock()
+# Lookups of per-season tables that found / had to build them
+table_cache_stats = {'hits': 0, 'misses': 0}
+
+
+@instrumented('walk')
+def build_games_frame(season):
+    """Walk a season snapshot's schedules once and return its games table"""
+    teams_by_id = {team['team_id']: team for team in season['teams']}
+    playoff_start_week = get_playoff_start_week(season['year'])
+    rows = []
+    processed_games = set()
+
+    for week in range(season['current_week']):
+        for team in season['teams']:
+            if week >= len(team['schedule']) or week >= len(team['scores']):
+                continue
+            opponent = teams_by_id.get(team['schedule'][week])
+            if opponent is None or week >= len(opponent['scores']):
+                continue
+
+            team_score = team['scores'][week]
+            opponent_score = opponent['scores'][week]
+            if team_score is None or opponent_score is None:
+                continue
+
+            # Avoid double counting
+            game_id = (week, *sorted([team['team_id'], opponent['team_id']]))
+            if game_id in processed_games:
+                continue
+            processed_games.add(game_id)
+
+            if opponent['team_id'] < team['team_id']:
+                team, opponent = opponent, team
+                team_score, opponent_score = opponent_score, team_score
+
+            rows.append((
+                season['year'], week + 1, week + 1 >= playoff_start_week, team is opponent,
+                team['team_id'], team['owner'], team_score,
+                opponent['team_id'], opponent['owner'], opponent_score
+            ))
+
+    games = pd.DataFrame(rows, columns=GAME_COLUMNS)
+    return games.astype({
+        'year': 'int64', 'week': 'int64', 'is_playoff': 'bool', 'is_bye': 'bool',
+        'team1_id': 'int64', 'team1_score': 'float64',
+        'team2_id': 'int64', 'team2_score': 'float64'
+    })
+
+def cached_season_table(season, name, build):
+    """Build a per-season table once per snapshot; a newer snapshot of the season replaces the old tables"""
+    key = (season['league_id'], season['year'])
+    with _games_cache_lock:
+        fetched_at, tables = _games_cache.get(key, (None, {}))
+        if fetched_at == season.get('fetched_at') and name in tables:
+            table_cache_stats['hits'] += 1
+            return tables[name]
+        table_cache_stats['misses'] += 1
+
+    table = build(season)
+    with _games_cache_lock:
+        fetched_at, tables = _games_cache.get(key, (None, {}))
+        if fetched_at != season.get('fetched_at'):
+            tables = {}
+        tables[name] = table
+        _games_cache[key] = (season.get('fetched_at'), tables)
+    return table
+
+def season_games_frame(season):
+    """The games table for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'games', build_games_frame)
+
+@instrumented('walk')
+def build_score_matrix(season):
+    """
+    Schedule/score matrices for a season, rows in season['teams'] order and one column per week index:
+    scores (n, weeks) float with NaN for missing scores, opponents (n, weeks) row index or -1.
+    """
+    teams = season['teams']
+    index = {team['team_id']: i for i, team in enumerate(teams)}
+    n_weeks = max([len(team['scores']) for team in teams], default=0)
+
+    scores = np.full((len(teams), n_weeks), np.nan)
+    opponents = np.full((len(teams), n_weeks), -1, dtype=np.intp)
+    for i, team in enumerate(teams):
+        team_scores = [np.nan if score is None else score for score in team['scores']]
+        scores[i, :len(team_scores)] = team_scores
+        team_opponents = [index.get(opponent_id, -1) for opponent_id in team['schedule'][:n_weeks]]
+        opponents[i, :len(team_opponents)] = team_opponents
+
+    return {'team_ids': [team['team_id'] for team in teams], 'scores': scores, 'opponents': opponents}
+
+def season_score_matrix(season):
+    """The schedule/score matrices for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'score_matrix', build_score_matrix)
+
+def games_frame(seasons):
+    """Games table covering several seasons, in year order"""
+    frames = [season_games_frame(season) for season in sorted(seasons, key=lambda s: s['year'])]
+    if not frames:
+        return pd.DataFrame(columns=GAME_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def team_games_frame(games):
+    """
+    One row per team per game (a bye appears once, against itself):
+    year, week, is_playoff, team_id, owner, score, opponent_id, opponent_owner, opponent_score
+    """
+    common = ['year', 'week', 'is_playoff']
+    team1_view = games[common + ['team1_id', 'team1_owner', 'team1_score', 'team2_id', 'team2_owner', 'team2_score']]
+    team2_view = games.loc[~games['is_bye'], common + ['team2_id', 'team2_owner', 'team2_score', 'team1_id', 'team1_owner', 'team1_score']]
+
+    columns = common + ['team_id', 'owner', 'score', 'opponent_id', 'opponent_owner', 'opponent_score']
+    team1_view = team1_view.set_axis(columns, axis=1)
+    team2_view = team2_view.set_axis(columns, axis=1)
+    return pd.concat([team1_view, team2_view], ignore_index=True).sort_values(['year', 'week', 'team_id'], kind='stable')
+
+def get_table_cache_stats():
+    with _games_cache_lock:
+        return dict(table_cache_stats)
+
+
+register_stats('season_tables', get_table_cache_stats)
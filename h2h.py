@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from games import season_games_frame
+from instrumentation import instrumented
+
+RECORD_TYPES = ['regular', 'playoffs', 'all']
+
+
+def new_h2h_arrays():
+    """Empty H2H accumulator - see build_h2h_arrays for the layout"""
+    h2h = {'keys': [], 'labels': [], 'label_years': []}
+    for record_type in RECORD_TYPES:
+        h2h[record_type] = accumulate_h2h(0, [], [], [], [])
+    return h2h
+
+def build_h2h_arrays(seasons, key='team'):
+    """
+    Accumulate H2H results into dense (n, n) arrays, one set per record type.
+    key='team' indexes by team_id (labelled with the latest team name),
+    key='owner' indexes by owner so records follow people across team changes.
+
+    Returns {'keys': [...], 'labels': [...], 'regular'/'playoffs'/'all': {'wins', 'ties', 'points'}} where
+    wins[i, j] is games i beat j, ties[i, j] tied games and points[i, j] points i scored against j.
+    """
+    h2h = new_h2h_arrays()
+    for season in sorted(seasons, key=lambda s: s['year']):
+        add_season_to_h2h(h2h, season, key=key)
+    return h2h
+
+def add_season_to_h2h(h2h, season, key='team', first_week=0, last_week=None):
+    """Fold one season's games from week indexes [first_week, last_week) into h2h in place"""
+    year = season['year']
+    index = {team_key: i for i, team_key in enumerate(h2h['keys'])}
+
+    for team in season['teams']:
+        team_key = team['team_id'] if key == 'team' else team['owner']
+        label = team['team_name'] if key == 'team' else team['owner']
+        if team_key not in index:
+            index[team_key] = len(h2h['keys'])
+            h2h['keys'].append(team_key)
+            h2h['labels'].append(label)
+            h2h['label_years'].append(year)
+        elif year >= h2h['label_years'][index[team_key]]:
+            # Latest season's name wins
+            h2h['labels'][index[team_key]] = label
+            h2h['label_years'][index[team_key]] = year
+
+    if last_week is None:
+        last_week = season['current_week']
+    games = season_games_frame(season)
+    games = games[(games['week'] > first_week) & (games['week'] <= last_week) & ~games['is_bye']]
+
+    id_column = 'id' if key == 'team' else 'owner'
+    team1_idxs = games[f'team1_{id_column}'].map(index).to_numpy(dtype=np.intp)
+    team2_idxs = games[f'team2_{id_column}'].map(index).to_numpy(dtype=np.intp)
+    # Two teams with the same owner don't count as a rivalry
+    counted = team1_idxs != team2_idxs
+    is_playoff = games['is_playoff'].to_numpy()
+
+    masks = {'regular': counted & ~is_playoff, 'playoffs': counted & is_playoff}
+    n = len(h2h['keys'])
+    for record_type, mask in masks.items():
+        season_arrays = accumulate_h2h(
+            n, team1_idxs[mask], team2_idxs[mask],
+            games['team1_score'].to_numpy()[mask], games['team2_score'].to_numpy()[mask]
+        )
+        for name, array in season_arrays.items():
+            # Existing arrays are padded when new teams/owners show up
+            existing = h2h[record_type][name]
+            array[:existing.shape[0], :existing.shape[1]] += existing
+            h2h[record_type][name] = array
+
+    # All games = regular season + playoffs
+    h2h['all'] = {
+        name: h2h['regular'][name] + h2h['playoffs'][name]
+        for name in h2h['regular']
+    }
+    return h2h
+
+def accumulate_h2h(n, team_idxs, opponent_idxs, team_scores, opponent_scores):
+    """Scatter a batch of games into wins/ties/points arrays"""
+    team_idxs = np.asarray(team_idxs, dtype=np.intp)
+    opponent_idxs = np.asarray(opponent_idxs, dtype=np.intp)
+    team_scores = np.asarray(team_scores, dtype=float)
+    opponent_scores = np.asarray(opponent_scores, dtype=float)
+
+    wins = np.zeros((n, n), dtype=np.int64)
+    ties = np.zeros((n, n), dtype=np.int64)
+    points = np.zeros((n, n), dtype=float)
+
+    team_won = team_scores > opponent_scores
+    opponent_won = opponent_scores > team_scores
+    tied = ~(team_won | opponent_won)
+
+    np.add.at(wins, (team_idxs[team_won], opponent_idxs[team_won]), 1)
+    np.add.at(wins, (opponent_idxs[opponent_won], team_idxs[opponent_won]), 1)
+    np.add.at(ties, (team_idxs[tied], opponent_idxs[tied]), 1)
+    np.add.at(ties, (opponent_idxs[tied], team_idxs[tied]), 1)
+    np.add.at(points, (team_idxs, opponent_idxs), team_scores)
+    np.add.at(points, (opponent_idxs, team_idxs), opponent_scores)
+
+    return {'wins': wins, 'ties': ties, 'points': points}
+
+@instrumented('frame')
+def h2h_matrix_frame(h2h, record_type='all'):
+    """
+    Render the display matrix: cell [row, col] is the row team's W-L against the column team.
+    Only teams with at least one decided game are shown, sorted by name.
+    """
+    wins = h2h[record_type]['wins']
+    labels = np.array(h2h['labels'], dtype=object)
+
+    played = (wins.sum(axis=0) + wins.sum(axis=1)) > 0
+    order = [i for i in np.argsort(labels, kind='stable') if played[i]]
+    wins = wins[np.ix_(order, order)]
+
+    cells = np.char.add(np.char.add(wins.astype(str), '-'), wins.T.astype(str)).astype(object)
+    np.fill_diagonal(cells, '-')
+
+    return pd.DataFrame(cells, index=labels[order], columns=labels[order])
+
+@instrumented('frame')
+def h2h_readable_records(h2h, record_type='all'):
+    """Name-keyed records ("A vs B") in both directions, for pairs with at least one decided game"""
+    wins = h2h[record_type]['wins']
+    labels = h2h['labels']
+
+    readable_records = {}
+    team1_idxs, team2_idxs = np.nonzero(np.triu(wins + wins.T, k=1))
+    for team1_idx, team2_idx in zip(team1_idxs, team2_idxs):
+        team1_name = labels[team1_idx]
+        team2_name = labels[team2_idx]
+        team1_wins = int(wins[team1_idx, team2_idx])
+        team2_wins = int(wins[team2_idx, team1_idx])
+
+        readable_records[f"{team1_name} vs {team2_name}"] = {
+            'team1': team1_name,
+            'team1_wins': team1_wins,
+            'team2': team2_name,
+            'team2_wins': team2_wins,
+            'total_games': team1_wins + team2_wins
+        }
+        readable_records[f"{team2_name} vs {team1_name}"] = {
+            'team1': team2_name,
+            'team1_wins': team2_wins,
+            'team2': team1_name,
+            'team2_wins': team1_wins,
+            'total_games': team1_wins + team2_wins
+        }
+
+    return readable_records
@@ -0,0 +1,181 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+import league_data
+from h2h import RECORD_TYPES, add_season_to_h2h, new_h2h_arrays
+from instrumentation import instrumented
+from league_data import load_seasons
+from stats import add_season_to_tallies, all_time_stats_from_tallies
+
+# Bump when the persisted aggregate layout changes
+AGGREGATE_VERSION = 2
+
+_aggregate_lock = threading.Lock()
+
+
+def completed_weeks(season):
+    """Weeks whose games are final: all of a finished season, otherwise those before the current week"""
+    if season.get('final'):
+        return season['current_week']
+    return max(season['current_week'] - 1, 0)
+
+def high_water_mark(weeks_folded):
+    """(year, last completed week) an aggregate has been folded through, or None if empty"""
+    if not weeks_folded:
+        return None
+    year = max(weeks_folded)
+    return (year, weeks_folded[year])
+
+def folded_hash(season, weeks):
+    """Fingerprint of the results in a season's first `weeks` weeks, to spot later stat corrections"""
+    results = [
+        (team['team_id'], team['owner'], team['scores'][:weeks], team['schedule'][:weeks])
+        for team in season['teams']
+    ]
+    return hashlib.sha256(json.dumps(results, default=str).encode()).hexdigest()
+
+def new_aggregate_state(new_data):
+    return {'weeks_folded': {}, 'folded_hashes': {}, 'data': new_data()}
+
+def aggregate_path(league_id, name):
+    return os.path.join(league_data.SNAPSHOT_DIR, str(league_id), 'aggregates', f"{name}.json")
+
+def read_aggregate(league_id, name, decode):
+    """Read a persisted aggregate state, or None if missing, unreadable or from an older layout"""
+    try:
+        with open(aggregate_path(league_id, name)) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if stored.get('version') != AGGREGATE_VERSION:
+        return None
+    return {
+        'weeks_folded': {int(year): weeks for year, weeks in stored['weeks_folded'].items()},
+        'folded_hashes': {int(year): digest for year, digest in stored['folded_hashes'].items()},
+        'data': decode(stored['data'])
+    }
+
+def write_aggregate(league_id, name, state, encode):
+    path = aggregate_path(league_id, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    stored = {
+        'version': AGGREGATE_VERSION,
+        'high_water_mark': high_water_mark(state['weeks_folded']),
+        'weeks_folded': state['weeks_folded'],
+        'folded_hashes': state['folded_hashes'],
+        'data': encode(state['data'])
+    }
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(stored, f)
+    os.replace(tmp_path, path)
+
+@instrumented('aggregate')
+def refresh_aggregate(league_id, name, years, espn_s2, swid, new_data, fold, encode, decode):
+    """
+    Bring a persisted aggregate up to date and return (data, errors).
+
+    fold(data, season, first_week, last_week) adds week indexes [first_week, last_week) in place.
+    Only completed weeks are folded into the persisted state, so a refresh after a new week
+    costs one week of work. The in-progress week is added to the returned copy only. If a newer
+    snapshot changed a week already folded (an ESPN stat correction), the aggregate is refolded
+    from the snapshots.
+    errors is a list of (year, exception) for seasons that could not be loaded.
+    """
+    years = list(years)
+    seasons = load_seasons(league_id, years, espn_s2, swid)
+    errors = [(year, error) for year, season, error in seasons if error is not None]
+
+    with _aggregate_lock:
+        state = read_aggregate(league_id, name, decode)
+        # A narrower year range can't be carved out of the stored totals - build it without persisting
+        persist = state is None or all(year in years for year in state['weeks_folded'])
+        if state is None or not persist:
+            state = new_aggregate_state(new_data)
+
+        loaded = {year: season for year, season, error in seasons if error is None}
+        corrected = [
+            year for year, weeks in state['weeks_folded'].items()
+            if year in loaded and state['folded_hashes'].get(year) != folded_hash(loaded[year], weeks)
+        ]
+        # Folded weeks can't be taken back out of the totals, so start over - unless a folded year
+        # failed to load this time, then the correction is picked up on a later refresh
+        changed = False
+        if corrected and all(year in loaded for year in state['weeks_folded']):
+            state = new_aggregate_state(new_data)
+            changed = True
+
+        for year, season, error in seasons:
+            if error is not None:
+                continue
+            folded = state['weeks_folded'].get(year, 0)
+            through = completed_weeks(season)
+            if through > folded:
+                fold(state['data'], season, folded, through)
+                state['weeks_folded'][year] = through
+                state['folded_hashes'][year] = folded_hash(season, through)
+                changed = True
+
+        if persist and changed:
+            try:
+                write_aggregate(league_id, name, state, encode)
+            except OSError as e:
+                print(f"Could not save {name} aggregate: {e}")
+
+        data = copy.deepcopy(state['data'])
+        weeks_folded = dict(state['weeks_folded'])
+
+    # Weeks still in progress are counted in this result but not persisted
+    for year, season, error in seasons:
+        if error is None and season['current_week'] > weeks_folded.get(year, 0):
+            fold(data, season, weeks_folded.get(year, 0), season['current_week'])
+
+    return data, errors
+
+def _encode_h2h(h2h):
+    encoded = {name: h2h[name] for name in ['keys', 'labels', 'label_years']}
+    for record_type in RECORD_TYPES:
+        encoded[record_type] = {name: array.tolist() for name, array in h2h[record_type].items()}
+    return encoded
+
+def _decode_h2h(encoded):
+    h2h = {name: encoded[name] for name in ['keys', 'labels', 'label_years']}
+    n = len(h2h['keys'])
+    for record_type in RECORD_TYPES:
+        h2h[record_type] = {
+            name: np.array(values, dtype=float if name == 'points' else np.int64).reshape(n, n)
+            for name, values in encoded[record_type].items()
+        }
+    return h2h
+
+def refresh_h2h(league_id, start_year, end_year, espn_s2=None, swid=None, key='team'):
+    """Incrementally maintained H2H arrays (see h2h.build_h2h_arrays) and per-year load errors"""
+    def fold(h2h, season, first_week, last_week):
+        add_season_to_h2h(h2h, season, key=key, first_week=first_week, last_week=last_week)
+
+    return refresh_aggregate(
+        league_id, f"h2h_{key}_{start_year}", range(start_year, end_year + 1), espn_s2, swid,
+        new_h2h_arrays, fold, _encode_h2h, _decode_h2h
+    )
+
+def refresh_all_time_stats(league_id, start_year, end_year, espn_s2=None, swid=None):
+    """Incrementally maintained all-time stats (see stats.all_time_stats_from_tallies) and per-year load errors"""
+    def fold(season_tallies, season, first_week, last_week):
+        tallies = season_tallies.setdefault(season['year'], [])
+        add_season_to_tallies(tallies, season, first_week, last_week)
+
+    def decode(encoded):
+        return {int(year): tallies for year, tallies in encoded.items()}
+
+    season_tallies, errors = refresh_aggregate(
+        league_id, f"all_time_stats_{start_year}", range(start_year, end_year + 1), espn_s2, swid,
+        dict, fold, dict, decode
+    )
+    return all_time_stats_from_tallies(season_tallies), errors
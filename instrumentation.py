@@ -0,0 +1,191 @@
+"""
+Where page renders spend their time, shown on the hidden Diagnostics page.
+
+Hot-path functions are wrapped with @instrumented(stage) (or `with timed(stage, name)`) and each
+page render runs inside render_scope(page). Stages:
+    fetch      ESPN requests and snapshot files
+    walk       walking snapshots / espn_api objects into tables and arrays
+    aggregate  H2H, stats and standings folds, simulations
+    frame      DataFrame builds
+    render     the rest of the render - Streamlit widgets and Plotly charts
+Each call is charged its own time only - the wall time not covered by nested timed calls.
+Calls in worker threads count towards the render that started them when the thread runs in a copy
+of its context (see league_data.load_seasons), so with parallel fetches the stages can add up to
+more than the render's wall time.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STAGES = ['fetch', 'walk', 'aggregate', 'frame', 'render']
+# Set FFA_INSTRUMENTATION=0 to skip timing altogether
+ENABLED = os.environ.get('FFA_INSTRUMENTATION', '1') != '0'
+# Set FFA_DIAGNOSTICS=1 (or open the app with ?diagnostics=1) to list the Diagnostics page
+DIAGNOSTICS_PAGE = os.environ.get('FFA_DIAGNOSTICS', '0') == '1'
+# Renders and individual calls kept in memory for this process
+RENDER_LOG_SIZE = 200
+CALL_LOG_SIZE = 5000
+
+_renders = deque(maxlen=RENDER_LOG_SIZE)
+_calls = deque(maxlen=CALL_LOG_SIZE)
+# Per function totals, keyed by (stage, name)
+_totals = {}
+_lock = threading.Lock()
+
+# Counters other modules expose here, name -> function returning a dict of numbers
+_stat_sources = {}
+
+# The render and the timed call running in this context
+_current_render = contextvars.ContextVar('ffa_current_render', default=None)
+_current_call = contextvars.ContextVar('ffa_current_call', default=None)
+
+
+def register_stats(name, source):
+    """Include source() - a dict of counters - in every render's stats and in the exported log"""
+    _stat_sources[name] = source
+
+def collect_stats():
+    return {name: dict(source()) for name, source in _stat_sources.items()}
+
+def stats_delta(before, after):
+    """How much each counter moved between two collect_stats() results"""
+    return {
+        name: {stat: value - before.get(name, {}).get(stat, 0) for stat, value in counters.items()}
+        for name, counters in after.items()
+    }
+
+def covered_ms(intervals):
+    """Wall time covered by (start, end) intervals, counting overlaps (children in parallel threads) once"""
+    covered = 0.0
+    reach = None
+    for start, end in sorted(intervals):
+        if reach is not None and start < reach:
+            start = reach
+        if end > start:
+            covered += end - start
+        reach = end if reach is None else max(reach, end)
+    return covered * 1000
+
+@contextmanager
+def timed(stage, name):
+    """Time the block as one call of `name` in `stage`"""
+    if not ENABLED:
+        yield
+        return
+
+    call = {'children': []}
+    parent = _current_call.get()
+    token = _current_call.set(call)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        _current_call.reset(token)
+        with _lock:
+            children = list(call['children'])
+        record = {
+            'stage': stage,
+            'name': name,
+            'ms': round(elapsed_ms, 3),
+            'self_ms': round(max(elapsed_ms - covered_ms(children), 0), 3),
+            'at': time.time(),
+            'thread': threading.current_thread().name
+        }
+        render = _current_render.get()
+
+        with _lock:
+            if parent is not None:
+                parent['children'].append((start, end))
+            _calls.append(record)
+            totals = _totals.setdefault((stage, name), {'calls': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0})
+            totals['calls'] += 1
+            totals['total_ms'] += record['ms']
+            totals['self_ms'] += record['self_ms']
+            totals['max_ms'] = max(totals['max_ms'], record['ms'])
+            if render is not None:
+                render['calls'].append(record)
+
+def instrumented(stage, name=None):
+    """Decorator form of timed, named module.function unless given a name"""
+    def decorate(func):
+        label = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def render_scope(page):
+    """Record one page render: total time, time per stage, its timed calls and the counters it moved"""
+    render = {'page': page, 'started_at': time.time(), 'calls': []}
+    if not ENABLED:
+        yield render
+        return
+
+    before = collect_stats()
+    token = _current_render.set(render)
+    start = time.perf_counter()
+    try:
+        yield render
+    finally:
+        total_ms = (time.perf_counter() - start) * 1000
+        _current_render.reset(token)
+
+        with _lock:
+            calls = list(render['calls'])
+        stages = dict.fromkeys(STAGES, 0.0)
+        for call in calls:
+            stages[call['stage']] = stages.get(call['stage'], 0.0) + call['self_ms']
+        # Whatever no timed call accounts for went to Streamlit and Plotly
+        stages['render'] += max(total_ms - sum(stages.values()), 0)
+
+        render['total_ms'] = round(total_ms, 3)
+        render['stages'] = {stage: round(ms, 3) for stage, ms in stages.items()}
+        render['stats'] = stats_delta(before, collect_stats())
+        with _lock:
+            _renders.append(render)
+
+def recent_renders():
+    """Recorded renders, most recent first"""
+    with _lock:
+        return list(reversed(_renders))
+
+def function_totals():
+    """Per function timings since the last reset, slowest (by own time) first"""
+    with _lock:
+        rows = [
+            {'stage': stage, 'name': name, 'calls': totals['calls'],
+             'total_ms': round(totals['total_ms'], 3), 'self_ms': round(totals['self_ms'], 3),
+             'mean_ms': round(totals['total_ms'] / totals['calls'], 3), 'max_ms': round(totals['max_ms'], 3)}
+            for (stage, name), totals in _totals.items()
+        ]
+    return sorted(rows, key=lambda row: row['self_ms'], reverse=True)
+
+def export_log():
+    """Everything recorded, as JSON: counters, per function totals, recent renders and calls"""
+    with _lock:
+        calls = list(_calls)
+    return json.dumps({
+        'exported_at': time.time(),
+        'stats': collect_stats(),
+        'functions': function_totals(),
+        'renders': recent_renders(),
+        'calls': calls
+    }, indent=2, default=str)
+
+def reset():
+    """Forget recorded renders and timings (counters belong to their modules and keep running)"""
+    with _lock:
+        _renders.clear()
+        _calls.clear()
+        _totals.clear()
@@ -0,0 +1,373 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from espn_http import pooled_league
+from instrumentation import instrumented, register_stats
+
+# Seasons already built in this process, keyed by (league_id, year)
+_season_cache = {}
+_season_cache_lock = threading.Lock()
+# Held while a season is being fetched, keyed by (league_id, year)
+_fetch_locks = {}
+# Seasons whose expired snapshots are still served (see serve_stale)
+_stale_ok = set()
+# Where load_season found each season: this process, the snapshot store or ESPN
+season_load_stats = {'memory': 0, 'disk': 0, 'espn': 0}
+
+# On-disk snapshot store shared by every session / process on this machine
+SNAPSHOT_DIR = os.environ.get(
+    'FFA_SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'season_snapshots')
+)
+# Bump when the snapshot layout changes so old files are refetched
+SNAPSHOT_VERSION = 4
+# Seconds a snapshot of the in-progress season is trusted before refetching
+CURRENT_SEASON_TTL = 60 * 60
+
+# Season fetch workers shared by every league, and how many of them one league may hold at once
+FETCH_POOL_SIZE = int(os.environ.get('FFA_FETCH_POOL_SIZE', 16))
+LEAGUE_FETCH_BUDGET = 4
+# Seconds a season may take to load before load_seasons gives up on it
+FETCH_TIMEOUT = 60
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+# Fetch slots per league, keyed by league_id -> (budget, semaphore)
+_fetch_budgets = {}
+# Season fetches submitted to the pool and not finished yet, keyed by (league_id, year) -> (future, running)
+# where running['at'] is when the worker picked it up
+_in_flight = {}
+
+
+def get_playoff_start_week(year):
+    """Get the correct playoff start week based on year"""
+    if year in [2019, 2020]:
+        return 14  # 13 regular season weeks, playoffs start week 14
+    else:
+        return 15  # 14 regular season weeks, playoffs start week 15
+
+def is_season_final(year, now=None):
+    """A season is final once its playoffs are done (February of the following year)"""
+    now = now or datetime.now()
+    return now >= datetime(year + 1, 2, 1)
+
+def get_owner_name(team):
+    """Get a display name for a team's owner - handle different formats"""
+    owner_name = "Unknown Owner"
+    if hasattr(team, 'owners') and team.owners:
+        if isinstance(team.owners, list) and len(team.owners) > 0:
+            owner_name = team.owners[0].get('firstName', '') + ' ' + team.owners[0].get('lastName', '')
+        elif isinstance(team.owners, dict):
+            owner_name = team.owners.get('firstName', '') + ' ' + team.owners.get('lastName', '')
+        else:
+            owner_name = str(team.owners[0]) if isinstance(team.owners, list) else str(team.owners)
+
+    owner_name = owner_name.strip()
+    if owner_name == "" or owner_name == " ":
+        owner_name = f"Team {team.team_id}"
+    return owner_name
+
+@instrumented('walk')
+def snapshot_league(league):
+    """
+    Normalize an espn_api League into plain dicts/lists.
+    Opponents in 'schedule' are stored as team_ids (None when ESPN gave no opponent).
+    """
+    teams = []
+    for team in league.teams:
+        schedule = []
+        for opponent in team.schedule:
+            schedule.append(opponent.team_id if hasattr(opponent, 'team_id') else None)
+
+        roster = []
+        if hasattr(team, 'roster'):
+            for player in team.roster:
+                roster.append({
+                    'Player ID': player.playerId,
+                    'Player': player.name,
+                    'Position': player.position,
+                    'Points': player.total_points,
+                    'Avg Points': player.avg_points,
+                    'Projected Avg Points': player.projected_avg_points if hasattr(player, 'projected_avg_points') else 0,
+                    'Pro Team': player.proTeam if hasattr(player, 'proTeam') else 'FA',
+                    'Injury Status': player.injuryStatus if hasattr(player, 'injuryStatus') else 'ACTIVE'
+                })
+
+        teams.append({
+            'team_id': team.team_id,
+            'team_name': team.team_name,
+            'owner': get_owner_name(team),
+            'wins': team.wins,
+            'losses': team.losses,
+            'ties': team.ties if hasattr(team, 'ties') else 0,
+            'points_for': team.points_for,
+            'standing': team.standing,
+            'scores': list(team.scores),
+            'schedule': schedule,
+            'roster': roster
+        })
+
+    settings = {}
+    if hasattr(league, 'settings'):
+        settings = {
+            'playoff_team_count': league.settings.playoff_team_count,
+            'playoff_matchup_period_length': league.settings.playoff_matchup_period_length
+        }
+
+    return {
+        'league_id': league.league_id,
+        'year': league.year,
+        'current_week': league.current_week,
+        'settings': settings,
+        'teams': teams
+    }
+
+def is_snapshot_fresh(season, now=None):
+    """Finalized seasons never expire - only the current season is subject to the TTL"""
+    if season.get('final'):
+        return True
+    now = now if now is not None else time.time()
+    return now - season.get('fetched_at', 0) < CURRENT_SEASON_TTL
+
+def snapshot_path(league_id, year):
+    return os.path.join(SNAPSHOT_DIR, str(league_id), f"{year}.json")
+
+@instrumented('fetch')
+def read_snapshot(league_id, year):
+    """Read a stored snapshot, or None if it is missing, unreadable or from an older layout"""
+    path = snapshot_path(league_id, year)
+    try:
+        with open(path) as f:
+            season = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if season.get('version') != SNAPSHOT_VERSION:
+        return None
+    return season
+
+@instrumented('fetch')
+def write_snapshot(season):
+    """Write a snapshot atomically so readers never see a half-written file"""
+    path = snapshot_path(season['league_id'], season['year'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(season, f)
+    os.replace(tmp_path, path)
+
+def fetch_season(league_id, year, espn_s2=None, swid=None):
+    """
+    Fetch a fresh snapshot from ESPN, store it and swap it in for this process.
+    Readers keep the previous snapshot until the new one is complete.
+    Concurrent calls for the same season make one fetch.
+    """
+    key = (league_id, year)
+    requested_at = time.time()
+    with _season_cache_lock:
+        fetch_lock = _fetch_locks.setdefault(key, threading.Lock())
+
+    # One fetch per season at a time - callers that queued behind it share its snapshot
+    with fetch_lock:
+        with _season_cache_lock:
+            season = _season_cache.get(key)
+        if season is not None and season['fetched_at'] >= requested_at:
+            return season
+        return _fetch_season(league_id, year, espn_s2, swid)
+
+def _fetch_season(league_id, year, espn_s2, swid):
+    league = pooled_league(league_id, year, espn_s2=espn_s2, swid=swid)
+    season = snapshot_league(league)
+    season['version'] = SNAPSHOT_VERSION
+    season['fetched_at'] = time.time()
+    season['final'] = is_season_final(year)
+
+    try:
+        write_snapshot(season)
+    except OSError as e:
+        # Still usable for this process, just not persisted
+        print(f"Could not save {year} snapshot: {e}")
+
+    return cache_season(season)
+
+def cache_season(season):
+    """Make a snapshot the one load_season returns for its league-year in this process"""
+    with _season_cache_lock:
+        _season_cache[(season['league_id'], season['year'])] = season
+    return season
+
+def serve_stale(league_id, year, enabled=True):
+    """
+    Let load_season return an expired snapshot of (league_id, year) instead of fetching,
+    for seasons something else (the background refresher) keeps up to date.
+    """
+    with _season_cache_lock:
+        if enabled:
+            _stale_ok.add((league_id, year))
+        else:
+            _stale_ok.discard((league_id, year))
+
+def load_season(league_id, year, espn_s2=None, swid=None):
+    """
+    Get the season snapshot for (league_id, year).
+    Checks this process first, then the on-disk store, and only then ESPN.
+    Errors from ESPN are raised to the caller.
+    """
+    key = (league_id, year)
+    with _season_cache_lock:
+        season = _season_cache.get(key)
+        stale_ok = key in _stale_ok
+    if season is not None and (stale_ok or is_snapshot_fresh(season)):
+        _count_load('memory')
+        return season
+
+    season = read_snapshot(league_id, year)
+    if season is None or not (stale_ok or is_snapshot_fresh(season)):
+        _count_load('espn')
+        return fetch_season(league_id, year, espn_s2, swid)
+
+    _count_load('disk')
+    return cache_season(season)
+
+def _count_load(source):
+    with _season_cache_lock:
+        season_load_stats[source] += 1
+
+def get_season_load_stats():
+    with _season_cache_lock:
+        return dict(season_load_stats)
+
+def get_fetch_pool():
+    """The season fetch workers shared by every league in this process"""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_POOL_SIZE, thread_name_prefix='season-fetch')
+        return _fetch_pool
+
+def set_fetch_budget(league_id, budget):
+    """Let a league hold at most `budget` fetch workers at once"""
+    with _fetch_pool_lock:
+        current = _fetch_budgets.get(league_id)
+        if current is None or current[0] != budget:
+            # Fetches already running release the semaphore they took
+            _fetch_budgets[league_id] = (budget, threading.BoundedSemaphore(budget))
+
+def fetch_budget(league_id):
+    """The semaphore bounding a league's fetches in the shared pool"""
+    with _fetch_pool_lock:
+        if league_id not in _fetch_budgets:
+            _fetch_budgets[league_id] = (LEAGUE_FETCH_BUDGET, threading.BoundedSemaphore(LEAGUE_FETCH_BUDGET))
+        return _fetch_budgets[league_id][1]
+
+def load_seasons(league_id, years, espn_s2=None, swid=None, timeout=FETCH_TIMEOUT):
+    """
+    Load several seasons at once through the shared fetch pool, at most the league's fetch budget
+    at a time, so one league's long history can't take every worker.
+    Returns a list of (year, season, error) in year order - error is None on success,
+    otherwise the exception for that year (a TimeoutError if its fetch ran past `timeout` seconds).
+    A season whose fetch is still running, from this or an earlier call, is waited on rather than fetched again.
+    """
+    years = sorted(years)
+    pool = get_fetch_pool()
+    budget = fetch_budget(league_id)
+
+    def fetch(year, running):
+        running['at'] = time.monotonic()
+        return load_season(league_id, year, espn_s2, swid)
+
+    def finished(key, future):
+        # The slot is held until the worker is really free, even if every caller gave up on it -
+        # so a league whose fetches hang can't hold more than its budget of the shared workers
+        with _fetch_pool_lock:
+            if _in_flight.get(key, (None,))[0] is future:
+                del _in_flight[key]
+        budget.release()
+
+    def in_flight(year):
+        with _fetch_pool_lock:
+            return _in_flight.get((league_id, year))
+
+    results = {}
+    queued = list(years)
+    pending = {}
+    submitted = []
+    try:
+        while queued or pending:
+            while queued:
+                # A fetch of this season is still running (maybe one an earlier call timed out on) - wait
+                # for it rather than start another
+                joined = in_flight(queued[0])
+                if joined is not None:
+                    pending[joined[0]] = (queued.pop(0), joined[1])
+                    continue
+
+                # Submit years while the league has budget left; with nothing running, wait briefly for a slot
+                if not (budget.acquire(blocking=False) or (not pending and budget.acquire(timeout=0.05))):
+                    break
+                year = queued[0]
+                key = (league_id, year)
+                with _fetch_pool_lock:
+                    joined = _in_flight.get(key)
+                    if joined is None:
+                        running = {}
+                        # Each fetch runs in a copy of the caller's context, so its timings count towards the caller's render
+                        future = pool.submit(contextvars.copy_context().run, fetch, year, running)
+                        _in_flight[key] = (future, running)
+                if joined is not None:
+                    # Another call started it while we waited for the slot
+                    budget.release()
+                    continue
+                future.add_done_callback(functools.partial(finished, key))
+                submitted.append(future)
+                pending[future] = (queued.pop(0), running)
+            if not pending:
+                continue
+
+            # Wake up when something finishes or the oldest running fetch hits its timeout
+            now = time.monotonic()
+            deadlines = [running['at'] + timeout for year, running in pending.values() if 'at' in running]
+            wait_for = max(min(deadlines) - now, 0) if deadlines else 0.05
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                year = pending.pop(future)[0]
+                try:
+                    results[year] = (future.result(), None)
+                except Exception as e:
+                    results[year] = (None, e)
+
+            now = time.monotonic()
+            for future, (year, running) in list(pending.items()):
+                if 'at' in running and now - running['at'] >= timeout:
+                    # The worker can't be interrupted - stop waiting for it and report the year. It keeps
+                    # its slot, and later calls for the year wait on it instead of fetching again.
+                    del pending[future]
+                    results[year] = (None, TimeoutError(f"Timed out after {timeout}s loading {year}"))
+    finally:
+        # Years this call submitted that haven't started give their slot back
+        for future in submitted:
+            if future in pending:
+                future.cancel()
+
+    return [(year, *results[year]) for year in years]
+
+def clear_season_cache(league_id=None, year=None):
+    """Drop seasons cached in this process (all of them, one league, or one league-year)"""
+    with _season_cache_lock:
+        for key in list(_season_cache):
+            if league_id is not None and key[0] != league_id:
+                continue
+            if year is not None and key[1] != year:
+                continue
+            del _season_cache[key]
+
+
+register_stats('season_loads', get_season_load_stats)
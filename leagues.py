@@ -0,0 +1,71 @@
+"""
+The leagues this server hosts. Each league gets its own shared cache (cache_entries results) and
+fetch budget (season fetches it may run at once in the shared pool, see league_data.load_seasons),
+so one league's history load can't starve or evict the others.
+
+Leagues are read from FFA_LEAGUES_FILE, a JSON list where everything but league_id is optional:
+    [{"league_id": 23224200, "name": "My League", "espn_s2": "...", "swid": "{...}",
+      "fetch_budget": 4, "cache_entries": 256}]
+"""
+import json
+import os
+import threading
+
+from league_data import LEAGUE_FETCH_BUDGET, set_fetch_budget
+from shared_cache import LEAGUE_CACHE_ENTRIES, league_cache_for
+
+LEAGUES_FILE = os.environ.get(
+    'FFA_LEAGUES_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'leagues.json')
+)
+
+# Registered leagues keyed by league_id
+_leagues = {}
+_leagues_lock = threading.Lock()
+
+
+def register_league(league_id, name=None, espn_s2=None, swid=None, fetch_budget=LEAGUE_FETCH_BUDGET,
+                    cache_entries=LEAGUE_CACHE_ENTRIES):
+    """Host a league (or update its settings) and return its registry entry"""
+    league = {
+        'league_id': league_id,
+        'name': name or f"League {league_id}",
+        'espn_s2': espn_s2,
+        'swid': swid,
+        'fetch_budget': fetch_budget,
+        'cache_entries': cache_entries
+    }
+    set_fetch_budget(league_id, fetch_budget)
+    league_cache_for(league_id, cache_entries)
+
+    with _leagues_lock:
+        _leagues[league_id] = league
+    return league
+
+def load_leagues(path=LEAGUES_FILE):
+    """Register every league in a leagues file. Returns the registered entries ([] without a usable file)."""
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Could not read leagues file {path}: {e}")
+        return []
+
+    leagues = []
+    for entry in entries:
+        try:
+            leagues.append(register_league(**entry))
+        except TypeError as e:
+            print(f"Skipping league entry {entry.get('league_id')}: {e}")
+    return leagues
+
+def get_league(league_id):
+    with _leagues_lock:
+        return _leagues.get(league_id)
+
+def registered_leagues():
+    """Every hosted league, by name"""
+    with _leagues_lock:
+        return sorted(_leagues.values(), key=lambda league: league['name'])
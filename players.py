@@ -0,0 +1,74 @@
+import pandas as pd
+
+from games import cached_season_table
+from instrumentation import instrumented
+
+ROSTER_COLUMNS = ['Player ID', 'Player', 'Position', 'Points', 'Avg Points', 'Projected Avg Points', 'Pro Team', 'Injury Status']
+PLAYER_COLUMNS = ROSTER_COLUMNS + ['Owner', 'Team Name', 'Label']
+CATEGORY_COLUMNS = ['Position', 'Owner', 'Pro Team']
+
+
+def player_label(player, owner):
+    """How a rostered player is shown in selectors"""
+    return f"{player} ({owner})"
+
+@instrumented('frame')
+def build_players_frame(season):
+    """
+    Every rostered player in the league as one frame, indexed by ESPN player id.
+    Position, Owner and Pro Team are categoricals; Label is the "Name (Owner)" selector text.
+    """
+    rows = [
+        {**player, 'Owner': team['owner'], 'Team Name': team['team_name'], 'Label': player_label(player['Player'], team['owner'])}
+        for team in season['teams']
+        for player in team['roster']
+    ]
+    players = pd.DataFrame(rows, columns=PLAYER_COLUMNS)
+    players = players.astype({'Player ID': 'int64', 'Points': 'float64', 'Avg Points': 'float64', 'Projected Avg Points': 'float64'})
+    players = players.astype({column: 'category' for column in CATEGORY_COLUMNS})
+
+    players = players.set_index('Player ID')
+    # A player can only be rostered once, but don't let bad data make a lookup ambiguous
+    return players[~players.index.duplicated()]
+
+def season_players_frame(season):
+    """The league-wide players frame for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'players', build_players_frame)
+
+@instrumented('aggregate')
+def build_player_index(season):
+    """
+    Lookup structures for the Player Analysis page, precomputed once per snapshot:
+      'players':        the players frame plus 'Position Rank' (1 = most points) and 'Position Percentile'
+      'by_id':          {player_id: row as a dict}
+      'by_position':    {position: that position's players, sorted by points}
+      'position_stats': league-wide summary per position
+    """
+    players = season_players_frame(season).copy()
+
+    by_points = players.groupby('Position', observed=True)['Points']
+    players['Position Rank'] = by_points.rank(method='min', ascending=False).astype('int64')
+    players['Position Percentile'] = (by_points.rank(method='max', pct=True) * 100).round(1)
+
+    ranked = players.sort_values(['Position', 'Position Rank'], kind='stable')
+    by_position = {
+        position: group
+        for position, group in ranked.groupby('Position', observed=True, sort=False)
+    }
+
+    position_stats = players.groupby('Position', observed=True).agg({
+        'Points': ['mean', 'max', 'min', 'count'],
+        'Avg Points': 'mean'
+    }).round(2)
+    position_stats.columns = ['Avg Total Points', 'Max Points', 'Min Points', 'Player Count', 'Avg Per Game']
+
+    return {
+        'players': players,
+        'by_id': players.to_dict('index'),
+        'by_position': by_position,
+        'position_stats': position_stats.reset_index()
+    }
+
+def season_player_index(season):
+    """The player index for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'player_index', build_player_index)
@@ -0,0 +1,186 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from games import season_score_matrix
+from incremental import completed_weeks
+from instrumentation import instrumented
+from league_data import get_playoff_start_week
+from predictor import season_score_models
+from standings import season_standings_weeks
+
+# Simulated seasons per run, and how many are drawn at once (bounds memory per batch)
+SEASON_SIMULATIONS = 100_000
+BATCH_SIZE = 20_000
+# Used when the snapshot has no league settings
+DEFAULT_PLAYOFF_TEAMS = 6
+
+
+def bracket_order(size):
+    """Seeds (1-based) in bracket order, so adjacent slots meet: 8 -> [1, 8, 4, 5, 2, 7, 3, 6]"""
+    order = [1]
+    while len(order) < size:
+        n = len(order) * 2
+        order = [seed for top_seed in order for seed in (top_seed, n + 1 - top_seed)]
+    return order
+
+def build_simulation_inputs(season):
+    """
+    Everything a simulation batch needs as plain arrays (picklable, for worker processes):
+    the standings so far, the remaining regular season pairings, each team's score model
+    and the playoff bracket, including playoff rounds already played.
+    """
+    teams = season['teams']
+    n_teams = len(teams)
+    settings = season.get('settings') or {}
+    playoff_start_week = get_playoff_start_week(season['year'])
+    regular_weeks = playoff_start_week - 1
+    weeks_done = completed_weeks(season)
+
+    # Standings through the completed regular season weeks
+    standings = season_standings_weeks(season)
+    through = min(weeks_done, regular_weeks, standings['wins'].shape[1])
+    if through > 0:
+        wins = standings['wins'][:, through - 1] + standings['ties'][:, through - 1] / 2
+        points_for = standings['points_for'][:, through - 1]
+    else:
+        wins, points_for = np.zeros(n_teams), np.zeros(n_teams)
+
+    # Remaining regular season games, each pair once
+    matrix = season_score_matrix(season)
+    scores, opponents = matrix['scores'], matrix['opponents']
+    rows = np.arange(n_teams)
+    pair_teams, pair_opponents = [], []
+    for week in range(through, min(regular_weeks, opponents.shape[1])):
+        games = opponents[:, week] > rows
+        pair_teams.extend(rows[games])
+        pair_opponents.extend(opponents[games, week])
+
+    models = season_score_models(season)
+    playoff_teams = min(settings.get('playoff_team_count') or DEFAULT_PLAYOFF_TEAMS, n_teams)
+    bracket_size = 2 ** math.ceil(math.log2(max(playoff_teams, 1)))
+    round_weeks = max(settings.get('playoff_matchup_period_length') or 1, 1)
+
+    # Playoff rounds already played: each team's opponent and score per round (-1 / NaN if not played)
+    n_rounds = int(math.log2(bracket_size))
+    actual_round_opponents = np.full((n_teams, n_rounds), -1, dtype=np.intp)
+    actual_round_scores = np.full((n_teams, n_rounds), np.nan)
+    for playoff_round in range(n_rounds):
+        first = regular_weeks + playoff_round * round_weeks
+        last = first + round_weeks
+        if last <= min(weeks_done, scores.shape[1]):
+            actual_round_opponents[:, playoff_round] = opponents[:, first]
+            actual_round_scores[:, playoff_round] = scores[:, first:last].sum(axis=1)
+
+    return {
+        'wins': np.asarray(wins, dtype=float),
+        'points_for': np.asarray(points_for, dtype=float),
+        'pair_teams': np.asarray(pair_teams, dtype=np.intp),
+        'pair_opponents': np.asarray(pair_opponents, dtype=np.intp),
+        'means': np.array([models[team['team_id']]['mean'] for team in teams]),
+        'stds': np.array([models[team['team_id']]['std'] for team in teams]),
+        'playoff_teams': playoff_teams,
+        'byes': bracket_size - playoff_teams,
+        'bracket': bracket_order(bracket_size),
+        'round_weeks': round_weeks,
+        'actual_round_opponents': actual_round_opponents,
+        'actual_round_scores': actual_round_scores
+    }
+
+def simulate_season_batch(inputs, simulations, seed=None):
+    """
+    Play out the rest of the season `simulations` times at once and count, per team,
+    playoff berths, byes, championships and total wins.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(inputs['means'])
+    means, stds = inputs['means'], inputs['stds']
+
+    # Remaining regular season: one column per game, summed into teams with one-hot matrices
+    wins = np.broadcast_to(inputs['wins'], (simulations, n_teams)).copy()
+    points_for = np.broadcast_to(inputs['points_for'], (simulations, n_teams)).copy()
+    pair_teams, pair_opponents = inputs['pair_teams'], inputs['pair_opponents']
+    if len(pair_teams):
+        team_scores = np.maximum(means[pair_teams] + stds[pair_teams] * rng.standard_normal((simulations, len(pair_teams))), 0)
+        opponent_scores = np.maximum(means[pair_opponents] + stds[pair_opponents] * rng.standard_normal((simulations, len(pair_teams))), 0)
+        team_onehot = np.eye(n_teams)[pair_teams]
+        opponent_onehot = np.eye(n_teams)[pair_opponents]
+
+        team_won = (team_scores > opponent_scores).astype(float)
+        tied = (team_scores == opponent_scores) / 2
+        wins += (team_won + tied) @ team_onehot + (1 - team_won - tied) @ opponent_onehot
+        points_for += team_scores @ team_onehot + opponent_scores @ opponent_onehot
+
+    # Seeding: wins (ties count half), then points for
+    seeds = np.lexsort((-points_for, -wins), axis=-1)
+    playoff_teams, byes = inputs['playoff_teams'], inputs['byes']
+
+    # Bracket slots hold team indexes, -1 for an empty (bye) slot
+    bracket = np.array(inputs['bracket']) - 1
+    slots = np.where(bracket < playoff_teams, seeds[:, np.minimum(bracket, n_teams - 1)], -1)
+    round_weeks = inputs['round_weeks']
+    actual_round_opponents = inputs['actual_round_opponents']
+    actual_round_scores = inputs['actual_round_scores']
+
+    playoff_round = 0
+    while slots.shape[1] > 1:
+        team, opponent = slots[:, 0::2], slots[:, 1::2]
+        team_idx, opponent_idx = np.maximum(team, 0), np.maximum(opponent, 0)
+
+        team_score = means[team_idx] * round_weeks + stds[team_idx] * np.sqrt(round_weeks) * rng.standard_normal(team.shape)
+        opponent_score = means[opponent_idx] * round_weeks + stds[opponent_idx] * np.sqrt(round_weeks) * rng.standard_normal(team.shape)
+        # A game that really happened keeps its real result
+        played = (
+            (actual_round_opponents[team_idx, playoff_round] == opponent) &
+            ~np.isnan(actual_round_scores[team_idx, playoff_round]) &
+            ~np.isnan(actual_round_scores[opponent_idx, playoff_round])
+        )
+        team_score = np.where(played, actual_round_scores[team_idx, playoff_round], team_score)
+        opponent_score = np.where(played, actual_round_scores[opponent_idx, playoff_round], opponent_score)
+
+        winner = np.where(team_score >= opponent_score, team, opponent)
+        slots = np.where(opponent < 0, team, np.where(team < 0, opponent, winner))
+        playoff_round += 1
+
+    return {
+        'playoffs': np.bincount(seeds[:, :playoff_teams].ravel(), minlength=n_teams),
+        'byes': np.bincount(seeds[:, :byes].ravel(), minlength=n_teams),
+        'championships': np.bincount(slots[:, 0], minlength=n_teams),
+        'wins': wins.sum(axis=0)
+    }
+
+@instrumented('aggregate')
+def simulate_season(season, simulations=SEASON_SIMULATIONS, workers=1, seed=None):
+    """
+    Playoff, bye and championship odds for every team from `simulations` simulated seasons.
+    Batches run in worker processes when workers > 1, each with its own random stream.
+    """
+    inputs = build_simulation_inputs(season)
+    if seed is None:
+        # Same snapshot, same answer
+        seed = [season['year'], completed_weeks(season)]
+
+    batch_sizes = [BATCH_SIZE] * (simulations // BATCH_SIZE)
+    if simulations % BATCH_SIZE:
+        batch_sizes.append(simulations % BATCH_SIZE)
+    batch_seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+    if workers > 1 and len(batch_sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_season_batch, repeat(inputs), batch_sizes, batch_seeds))
+    else:
+        results = [simulate_season_batch(inputs, size, batch_seed) for size, batch_seed in zip(batch_sizes, batch_seeds)]
+
+    totals = {name: sum(result[name] for result in results) for name in results[0]}
+    odds = pd.DataFrame({
+        'Team': [team['team_name'] for team in season['teams']],
+        'Owner': [team['owner'] for team in season['teams']],
+        'Projected Wins': (totals['wins'] / simulations).round(1),
+        'Playoffs %': (totals['playoffs'] / simulations * 100).round(1),
+        'Bye %': (totals['byes'] / simulations * 100).round(1),
+        'Championship %': (totals['championships'] / simulations * 100).round(1)
+    })
+    return odds.sort_values(['Championship %', 'Playoffs %'], ascending=False, ignore_index=True)
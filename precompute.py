@@ -0,0 +1,138 @@
+"""
+Precompute league analytics without Streamlit, e.g. from a nightly job:
+
+    python precompute.py --league 23224200 [--start-year 2019] [--end-year 2024] [--refresh] [--output DIR] [--sqlite DB]
+    python precompute.py --all-leagues
+
+Every season is loaded into the snapshot store and folded into the persisted H2H and all-time stats
+aggregates. These are the stores the dashboard reads before going to ESPN, so after a run its pages
+only build tables from them. --refresh refetches seasons still in progress; --output also writes the
+H2H matrices, all-time stats and each season's standings as CSV/JSON, and --sqlite exports the
+seasons into normalized tables (see sql_export.py). When some seasons fail to load, the outputs are
+built from the ones that did and the aggregates are left for the next run; when none load, nothing
+is written.
+
+Credentials come from --espn-s2/--swid, FFA_ESPN_S2/FFA_SWID or the league's entry in the leagues
+file (see leagues.py); --all-leagues runs every league in that file.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+from dashboard_data import calculate_all_time_stats, create_h2h_matrices, get_standings
+from h2h import RECORD_TYPES, build_h2h_arrays, h2h_matrix_frame
+from league_data import fetch_season, is_season_final, load_seasons
+from leagues import get_league, load_leagues, registered_leagues
+from sql_export import export_seasons
+from stats import all_time_stats_from_seasons
+
+# The range the dashboard pages show, so the aggregates built here are the ones they read
+FIRST_YEAR = 2019
+LAST_YEAR = 2024
+
+
+def write_artifacts(output_dir, league_id, h2h_matrices, all_time_stats, standings):
+    league_dir = os.path.join(output_dir, str(league_id))
+    os.makedirs(league_dir, exist_ok=True)
+
+    for record_type, h2h_matrix in h2h_matrices.items():
+        h2h_matrix.to_csv(os.path.join(league_dir, f"h2h_{record_type}.csv"))
+    with open(os.path.join(league_dir, 'all_time_stats.json'), 'w') as f:
+        # Totals can be numpy scalars
+        json.dump(all_time_stats, f, indent=2, default=lambda value: value.item())
+    for year, standings_df in standings.items():
+        standings_df.to_csv(os.path.join(league_dir, f"standings_{year}.csv"), index=False)
+
+def precompute_league(league_id, start_year=FIRST_YEAR, end_year=LAST_YEAR, espn_s2=None, swid=None,
+                      refresh=False, output_dir=None, sqlite_path=None):
+    """Load, aggregate and persist everything the dashboard reads for one league. Returns the error messages."""
+    years = range(start_year, end_year + 1)
+    errors = []
+
+    start = time.perf_counter()
+    if refresh:
+        for year in years:
+            if is_season_final(year):
+                continue
+            try:
+                fetch_season(league_id, year, espn_s2, swid)
+            except Exception as e:
+                errors.append(f"Error refreshing {year}: {e}")
+
+    seasons = load_seasons(league_id, years, espn_s2, swid)
+    loaded_seasons = [season for year, season, error in seasons if error is None]
+    loaded = [season['year'] for season in loaded_seasons]
+    errors.extend(f"Error loading {year}: {error}" for year, season, error in seasons if error is not None)
+    print(f"League {league_id}: loaded {len(loaded)}/{len(years)} seasons in {time.perf_counter() - start:.1f}s")
+    if not loaded:
+        # Nothing to build - leave the previous run's artifacts in place
+        return errors
+
+    start = time.perf_counter()
+    if len(loaded) == len(years):
+        h2h_matrices = create_h2h_matrices(league_id, start_year, end_year, espn_s2, swid)
+        all_time_stats = calculate_all_time_stats(league_id, start_year, end_year, espn_s2, swid)
+    else:
+        # The persisted aggregates would load (and retry) the failed years again - build from what loaded
+        h2h = build_h2h_arrays(loaded_seasons)
+        h2h_matrices = {record_type: h2h_matrix_frame(h2h, record_type) for record_type in RECORD_TYPES}
+        all_time_stats = all_time_stats_from_seasons(loaded_seasons)
+    standings = {year: get_standings(league_id, year, espn_s2, swid)[0] for year in loaded}
+    print(f"League {league_id}: built H2H, all-time stats and standings in {time.perf_counter() - start:.1f}s")
+
+    if output_dir:
+        write_artifacts(output_dir, league_id, h2h_matrices, all_time_stats, standings)
+        print(f"League {league_id}: wrote {os.path.join(output_dir, str(league_id))}")
+
+    if sqlite_path:
+        with closing(sqlite3.connect(sqlite_path)) as conn:
+            written = export_seasons(conn, loaded_seasons)
+        print(f"League {league_id}: exported to {sqlite_path} - rows written: "
+              + ', '.join(f"{table} {count}" for table, count in written.items()))
+
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--league', type=int, action='append', help="league id (repeat for several leagues)")
+    parser.add_argument('--all-leagues', action='store_true', help="every league in the leagues file")
+    parser.add_argument('--start-year', type=int, default=FIRST_YEAR)
+    parser.add_argument('--end-year', type=int, default=LAST_YEAR)
+    parser.add_argument('--espn-s2', default=os.environ.get('FFA_ESPN_S2'))
+    parser.add_argument('--swid', default=os.environ.get('FFA_SWID'))
+    parser.add_argument('--refresh', action='store_true', help="refetch seasons still in progress")
+    parser.add_argument('--output', help="also write the results as CSV/JSON under this directory")
+    parser.add_argument('--sqlite', help="also export the seasons into this SQLite database")
+    args = parser.parse_args()
+
+    load_leagues()
+    if args.all_leagues:
+        targets = registered_leagues()
+    else:
+        targets = [
+            get_league(league_id) or {'league_id': league_id, 'espn_s2': None, 'swid': None}
+            for league_id in args.league or []
+        ]
+    if not targets:
+        parser.error("give --league, or --all-leagues with a leagues file")
+
+    failed = False
+    for league in targets:
+        errors = precompute_league(
+            league['league_id'], args.start_year, args.end_year,
+            espn_s2=args.espn_s2 or league['espn_s2'], swid=args.swid or league['swid'],
+            refresh=args.refresh, output_dir=args.output, sqlite_path=args.sqlite
+        )
+        for message in errors:
+            print(f"League {league['league_id']}: {message}")
+        failed = failed or bool(errors)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from games import cached_season_table, season_score_matrix
+from incremental import completed_weeks
+from instrumentation import instrumented
+
+# Simulated games per matchup
+SIMULATIONS = 100_000
+# Games of history it takes for a team's own scoring to outweigh its projection / the league spread
+PRIOR_GAMES = 4
+# Starting lineup the projection is built from
+LINEUP_SLOTS = [('QB', ['QB']), ('RB1', ['RB']), ('RB2', ['RB']), ('WR1', ['WR']), ('WR2', ['WR']),
+                ('TE', ['TE']), ('FLEX', ['RB', 'WR', 'TE']), ('K', ['K']), ('DST', ['D/ST'])]
+HISTOGRAM_BINS = 40
+
+
+def projected_lineup(roster):
+    """Fill LINEUP_SLOTS with the highest projected players available: [(slot, player or None)]"""
+    available = sorted(roster, key=lambda player: player.get('Projected Avg Points') or 0, reverse=True)
+    lineup = []
+    for slot, positions in LINEUP_SLOTS:
+        player = next((player for player in available if player['Position'] in positions), None)
+        if player is not None:
+            available.remove(player)
+        lineup.append((slot, player))
+    return lineup
+
+@instrumented('aggregate')
+def build_score_models(season):
+    """
+    Weekly score model for every team: a normal distribution whose mean blends the team's scoring
+    in completed weeks with its projected starting lineup, and whose spread is the team's own
+    weekly spread shrunk towards the league's. Returns {team_id: model}.
+    """
+    matrix = season_score_matrix(season)
+    scores = matrix['scores'][:, :completed_weeks(season)]
+    games = (~np.isnan(scores)).sum(axis=1)
+
+    if np.any(games > 0):
+        league_mean = np.nanmean(scores)
+        league_std = np.nanstd(scores) if np.sum(games) > 1 else league_mean * 0.2
+    else:
+        league_mean, league_std = 100.0, 20.0
+
+    history_mean = np.nansum(scores, axis=1) / np.maximum(games, 1)
+    history_var = np.nansum((scores - history_mean[:, None]) ** 2, axis=1) / np.maximum(games, 1)
+
+    models = {}
+    for i, team in enumerate(season['teams']):
+        lineup = projected_lineup(team['roster'])
+        projection = sum(player.get('Projected Avg Points') or 0 for _, player in lineup if player)
+
+        # Prior is the projection when there is one, otherwise the league average
+        prior_mean = projection if projection > 0 else league_mean
+        if games[i] > 0:
+            mean = (games[i] * history_mean[i] + PRIOR_GAMES * prior_mean) / (games[i] + PRIOR_GAMES)
+        else:
+            mean = prior_mean
+        std = np.sqrt((games[i] * history_var[i] + PRIOR_GAMES * league_std ** 2) / (games[i] + PRIOR_GAMES))
+
+        models[team['team_id']] = {
+            'mean': float(mean),
+            'std': float(std),
+            'projection': float(projection),
+            'history_mean': None if games[i] == 0 else float(history_mean[i]),
+            'games': int(games[i]),
+            'lineup': [
+                (slot, player['Player'] if player else None, (player.get('Projected Avg Points') or 0) if player else 0)
+                for slot, player in lineup
+            ]
+        }
+    return models
+
+def season_score_models(season):
+    """The score models for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'score_models', build_score_models)
+
+@instrumented('aggregate')
+def simulate_matchup(model, opponent_model, simulations=SIMULATIONS, seed=None):
+    """
+    Simulate a matchup between two score models in one vectorized draw.
+    Only summaries are returned (not the raw draws), so results are small enough to cache.
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_normal((2, simulations))
+    scores = np.maximum(draws * [[model['std']], [opponent_model['std']]] + [[model['mean']], [opponent_model['mean']]], 0)
+    margin = scores[0] - scores[1]
+
+    bins = np.histogram_bin_edges(scores, bins=HISTOGRAM_BINS)
+    percentiles = np.percentile(scores, [10, 50, 90], axis=1)
+    return {
+        'simulations': simulations,
+        'win_probability': float(np.mean(margin > 0)),
+        'opponent_win_probability': float(np.mean(margin < 0)),
+        'mean_scores': scores.mean(axis=1).tolist(),
+        'score_percentiles': percentiles.T.tolist(),
+        'margin_percentiles': np.percentile(margin, [10, 50, 90]).tolist(),
+        'histogram': {
+            'bins': bins.tolist(),
+            'counts': [np.histogram(team_scores, bins=bins)[0].tolist() for team_scores in scores]
+        }
+    }
+
+def predict_matchup(season, team_id, opponent_id, week=None):
+    """Win probability and score distributions for team_id vs opponent_id in a week of the season"""
+    week = season['current_week'] if week is None else week
+    models = season_score_models(season)
+    # Same inputs always give the same answer, so reruns don't flicker
+    seed = [season['year'], week, team_id, opponent_id]
+    prediction = simulate_matchup(models[team_id], models[opponent_id], seed=seed)
+    prediction.update({'week': week, 'models': [models[team_id], models[opponent_id]]})
+    return prediction
+
+def lineup_comparison_frame(prediction):
+    """Slot-by-slot projected points for both lineups"""
+    model, opponent_model = prediction['models']
+    return pd.DataFrame({
+        'Position': [slot for slot, _, _ in model['lineup']],
+        'Your_Team': [points for _, _, points in model['lineup']],
+        'Opponent': [points for _, _, points in opponent_model['lineup']]
+    })
@@ -0,0 +1,116 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from league_data import fetch_season, is_season_final, serve_stale
+
+# Set FFA_BACKGROUND_REFRESH=0 to only fetch when a page asks for data
+BACKGROUND_REFRESH = os.environ.get('FFA_BACKGROUND_REFRESH', '1') != '0'
+
+# Seconds between refreshes while games are on, otherwise, and once the season is over
+GAME_WINDOW_INTERVAL = 5 * 60
+IDLE_INTERVAL = 6 * 60 * 60
+OFFSEASON_INTERVAL = 24 * 60 * 60
+# NFL game windows in US Eastern time, whatever the server's timezone, as (weekday, start hour, end hour), Monday = 0
+GAME_TIMEZONE = ZoneInfo('America/New_York')
+GAME_WINDOWS = [
+    (3, 20, 24),  # Thursday night
+    (6, 13, 24),  # Sunday
+    (0, 20, 24)   # Monday night
+]
+
+# Running refreshers keyed by league_id -> stop event
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def current_season_year(now=None):
+    """The season in progress (or most recently played): seasons start in September"""
+    now = now or datetime.now()
+    return now.year if now.month >= 9 else now.year - 1
+
+def game_time(now=None):
+    """now (default: the current time; naive means server local time) in GAME_TIMEZONE"""
+    if now is None:
+        return datetime.now(GAME_TIMEZONE)
+    return now.astimezone(GAME_TIMEZONE)
+
+def in_game_window(now=None):
+    now = game_time(now)
+    return any(
+        now.weekday() == weekday and start <= now.hour < end
+        for weekday, start, end in GAME_WINDOWS
+    )
+
+def seconds_until_next_window(now=None):
+    """Seconds from now until the next game window starts"""
+    now = game_time(now)
+    starts = []
+    for days in range(8):
+        day = now.date() + timedelta(days=days)
+        for weekday, start, end in GAME_WINDOWS:
+            if day.weekday() == weekday:
+                starts.append(datetime(day.year, day.month, day.day, start, tzinfo=GAME_TIMEZONE))
+    return min((start - now).total_seconds() for start in starts if start > now)
+
+def refresh_interval(year, now=None):
+    """
+    Seconds until the next refresh: often during games, daily once the season is final, and otherwise
+    rarely - but never past the start of the next game window.
+    """
+    now = game_time(now)
+    if is_season_final(year, now.replace(tzinfo=None)):
+        return OFFSEASON_INTERVAL
+    if in_game_window(now):
+        return GAME_WINDOW_INTERVAL
+    return min(IDLE_INTERVAL, seconds_until_next_window(now))
+
+def refresh_current_season(league_id, espn_s2=None, swid=None, on_refresh=None):
+    """
+    Fetch the current season once, if it is still in progress, and hand the new snapshot to
+    on_refresh(season). Returns the snapshot, or None when there was nothing to refresh.
+    """
+    year = current_season_year()
+    if is_season_final(year):
+        return None
+
+    # Pages read whatever snapshot is in memory instead of fetching on expiry
+    serve_stale(league_id, year)
+    season = fetch_season(league_id, year, espn_s2, swid)
+    if on_refresh is not None:
+        on_refresh(season)
+    return season
+
+def _refresh_loop(league_id, espn_s2, swid, on_refresh, stop):
+    while not stop.is_set():
+        try:
+            refresh_current_season(league_id, espn_s2, swid, on_refresh)
+        except Exception as e:
+            print(f"Background refresh of league {league_id} failed: {e}")
+        stop.wait(refresh_interval(current_season_year()))
+
+def start_background_refresh(league_id, espn_s2=None, swid=None, on_refresh=None):
+    """
+    Keep the current season fresh from a daemon thread, once per process and league.
+    Safe to call on every Streamlit rerun - later calls are no-ops.
+    """
+    with _refreshers_lock:
+        if not BACKGROUND_REFRESH or league_id in _refreshers:
+            return False
+        stop = threading.Event()
+        _refreshers[league_id] = stop
+
+    thread = threading.Thread(
+        target=_refresh_loop, args=(league_id, espn_s2, swid, on_refresh, stop),
+        name=f"season-refresh-{league_id}", daemon=True
+    )
+    thread.start()
+    return True
+
+def stop_background_refresh(league_id):
+    with _refreshers_lock:
+        stop = _refreshers.pop(league_id, None)
+    if stop is not None:
+        stop.set()
+        serve_stale(league_id, current_season_year(), enabled=False)
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import register_stats
+from league_data import CURRENT_SEASON_TTL, is_season_final
+
+_MISSING = object()
+
+# Entries a league's cache holds unless the league is registered with its own budget (see leagues.py)
+LEAGUE_CACHE_ENTRIES = 256
+
+# One cache per league, keyed by league_id
+_league_caches = {}
+_league_caches_lock = threading.Lock()
+
+
+class SharedCache:
+    """
+    Process-wide LRU cache with optional per-entry TTL.
+    Lives in an imported module, so every Streamlit session on the server shares it.
+    """
+
+    def __init__(self, max_entries=256, default_ttl=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, callers]
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            # Evict least recently used entries past the size bound
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """
+        Return the cached value, or compute and cache it. Concurrent callers asking for the
+        same key wait for one computation instead of repeating it. Empty results are not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            # [lock, callers holding or waiting for it] - the last caller out drops the entry
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            with key_lock[0]:
+                # Another session may have filled it while we waited
+                with self._lock:
+                    value = self._lookup(key)
+                if value is not _MISSING:
+                    return value
+
+                value = compute()
+                if not is_empty(value):
+                    self.set(key, value, ttl)
+                return value
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+
+    def invalidate(self, match=None):
+        """Drop every entry, or only those whose key satisfies match(key)"""
+        with self._lock:
+            for key in list(self._entries):
+                if match is None or match(key):
+                    del self._entries[key]
+
+    def keys(self):
+        """Keys currently cached (expired entries included until they are next looked up)"""
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def is_empty(value):
+    return value is None or (isinstance(value, (dict, list)) and not value)
+
+def ttl_for_years(years):
+    """Results built only from finalized seasons never expire; anything touching the current season does"""
+    if all(is_season_final(year) for year in years):
+        return None
+    return CURRENT_SEASON_TTL
+
+def league_cache_for(league_id, max_entries=None):
+    """
+    The cache shared by every dashboard session of one league. Leagues never evict each other's
+    entries; max_entries (when given) resizes the league's cache.
+    """
+    with _league_caches_lock:
+        cache = _league_caches.get(league_id)
+        if cache is None:
+            cache = _league_caches[league_id] = SharedCache(max_entries or LEAGUE_CACHE_ENTRIES)
+        elif max_entries is not None:
+            cache.max_entries = max_entries
+        return cache
+
+def league_cache_stats():
+    """Entries, hits and misses summed over every league's cache"""
+    with _league_caches_lock:
+        caches = list(_league_caches.values())
+    totals = {'entries': 0, 'hits': 0, 'misses': 0}
+    for cache in caches:
+        for stat, value in cache.stats().items():
+            totals[stat] += value
+    return totals
+
+
+register_stats('league_cache', league_cache_stats)
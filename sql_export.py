@@ -0,0 +1,299 @@
+"""
+Export season snapshots into normalized SQL tables through any DB-API connection
+(sqlite3 locally, duckdb, or mysql.connector / pymysql for the MySQL database):
+
+    seasons       one row per season: current week, completed weeks and playoff start week
+    owners        one row per owner: first and last season in the league
+    teams         one row per team per season
+    games         one row per matchup (team1 is the lower team_id; a bye is a team against itself)
+    team_weeks    one row per team per game, with both owners - what the analytics queries read
+                  (see sql_queries.py); a bye appears once, against itself
+    rosters       each team's roster as of the snapshot
+    player_weeks  each rostered player's totals as of the snapshot's week - snapshots carry no
+                  per-week player scores, so repeated exports during a season build the weekly history
+
+Rows are grouped into partitions keyed by (league_id, year, week) (week 0 for season-level tables).
+A partition is only looked at when its contents changed since the last export (export_state keeps a
+hash per partition); then its new or changed rows are upserted in batches and rows that disappeared
+are deleted, as are the games of weeks a newer snapshot no longer has.
+
+    with sqlite3.connect('league.db') as conn:
+        export_seasons(conn, [load_season(league_id, year) for year in years])
+"""
+import hashlib
+import json
+import time
+
+from games import season_games_frame, team_games_frame
+from incremental import completed_weeks
+from league_data import get_playoff_start_week
+
+# Rows per executemany call
+BATCH_SIZE = 1000
+
+# Column types per dialect, and how each writes parameters and upserts
+DIALECTS = {
+    'sqlite': {'int': 'INTEGER', 'float': 'REAL', 'text': 'TEXT', 'param': '?', 'upsert': 'conflict'},
+    'duckdb': {'int': 'BIGINT', 'float': 'DOUBLE', 'text': 'VARCHAR', 'param': '?', 'upsert': 'conflict'},
+    'mysql': {'int': 'BIGINT', 'float': 'DOUBLE', 'text': 'VARCHAR(255)', 'param': '%s', 'upsert': 'duplicate'}
+}
+# Connection module -> dialect
+DRIVER_DIALECTS = {'sqlite3': 'sqlite', 'duckdb': 'duckdb', 'mysql': 'mysql', 'pymysql': 'mysql', 'MySQLdb': 'mysql'}
+# Tables a snapshot holds every week of, so a week missing from a newer snapshot is deleted
+# (player_weeks is left alone - each export adds the snapshot's week to its history)
+SNAPSHOT_WEEK_TABLES = ['games', 'team_weeks']
+
+TABLES = {
+    'seasons': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('current_week', 'int'), ('completed_weeks', 'int'),
+            ('playoff_start_week', 'int'), ('final', 'int')
+        ],
+        'key': ['league_id', 'year']
+    },
+    'owners': {
+        'columns': [('league_id', 'int'), ('owner', 'text'), ('first_year', 'int'), ('last_year', 'int')],
+        'key': ['league_id', 'owner']
+    },
+    'teams': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('team_id', 'int'), ('team_name', 'text'), ('owner', 'text'),
+            ('wins', 'int'), ('losses', 'int'), ('ties', 'int'), ('points_for', 'float'), ('standing', 'int')
+        ],
+        'key': ['league_id', 'year', 'team_id'],
+        'indexes': [['league_id', 'owner', 'year']]
+    },
+    'games': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('week', 'int'), ('is_playoff', 'int'), ('is_bye', 'int'),
+            ('team1_id', 'int'), ('team1_score', 'float'), ('team2_id', 'int'), ('team2_score', 'float')
+        ],
+        'key': ['league_id', 'year', 'week', 'team1_id']
+    },
+    'team_weeks': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('week', 'int'), ('is_playoff', 'int'), ('is_bye', 'int'),
+            ('team_id', 'int'), ('owner', 'text'), ('score', 'float'),
+            ('opponent_id', 'int'), ('opponent_owner', 'text'), ('opponent_score', 'float')
+        ],
+        'key': ['league_id', 'year', 'week', 'team_id'],
+        'indexes': [['league_id', 'owner', 'year', 'week', 'is_playoff'], ['league_id', 'year', 'is_playoff', 'team_id']]
+    },
+    'rosters': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('team_id', 'int'), ('player_id', 'int'), ('player', 'text'),
+            ('position', 'text'), ('pro_team', 'text'), ('points', 'float'), ('avg_points', 'float'),
+            ('projected_avg_points', 'float'), ('injury_status', 'text')
+        ],
+        'key': ['league_id', 'year', 'team_id', 'player_id']
+    },
+    'player_weeks': {
+        'columns': [
+            ('league_id', 'int'), ('year', 'int'), ('week', 'int'), ('team_id', 'int'), ('player_id', 'int'),
+            ('points', 'float'), ('avg_points', 'float'), ('projected_avg_points', 'float'), ('injury_status', 'text')
+        ],
+        'key': ['league_id', 'year', 'week', 'team_id', 'player_id']
+    },
+    'export_state': {
+        'columns': [
+            ('table_name', 'text'), ('league_id', 'int'), ('year', 'int'), ('week', 'int'),
+            ('row_hash', 'text'), ('row_count', 'int'), ('exported_at', 'float')
+        ],
+        'key': ['table_name', 'league_id', 'year', 'week']
+    }
+}
+
+
+def detect_dialect(conn):
+    # DuckDB's connection class lives in its _duckdb extension module
+    return DRIVER_DIALECTS.get(type(conn).__module__.split('.')[0].lstrip('_'), 'sqlite')
+
+def get_cursor(conn, dialect):
+    """A cursor to run statements on. A DuckDB cursor is a separate connection, so its connection runs them itself."""
+    return conn if dialect == 'duckdb' else conn.cursor()
+
+def begin(conn, dialect):
+    """Start a transaction where the driver doesn't implicitly: DuckDB autocommits and refuses commit() without one"""
+    if dialect == 'duckdb':
+        conn.begin()
+
+def create_schema(conn, dialect=None):
+    """Create the export tables and their indexes if they don't exist yet"""
+    dialect = dialect or detect_dialect(conn)
+    types = DIALECTS[dialect]
+    begin(conn, dialect)
+    cursor = get_cursor(conn, dialect)
+    for table, spec in TABLES.items():
+        columns = ', '.join(f"{name} {types[kind]}" for name, kind in spec['columns'])
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY ({', '.join(spec['key'])}))")
+
+        for index_columns in spec.get('indexes', []):
+            name = f"idx_{table}_{'_'.join(index_columns)}"
+            if dialect == 'mysql':
+                # MySQL has no CREATE INDEX IF NOT EXISTS
+                cursor.execute(
+                    "SELECT COUNT(*) FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s", (table, name)
+                )
+                if cursor.fetchone()[0]:
+                    continue
+                cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(index_columns)})")
+            else:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(index_columns)})")
+    conn.commit()
+
+def _plain(value):
+    """numpy scalars to Python values, which every driver can bind"""
+    return value.item() if hasattr(value, 'item') else value
+
+def upsert_sql(table, dialect):
+    spec, types = TABLES[table], DIALECTS[dialect]
+    names = [name for name, kind in spec['columns']]
+    updates = [name for name in names if name not in spec['key']]
+    sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join([types['param']] * len(names))})"
+    if types['upsert'] == 'duplicate':
+        return sql + " ON DUPLICATE KEY UPDATE " + ', '.join(f"{name} = VALUES({name})" for name in updates)
+    return sql + f" ON CONFLICT ({', '.join(spec['key'])}) DO UPDATE SET " + ', '.join(f"{name} = excluded.{name}" for name in updates)
+
+def upsert_rows(cursor, table, rows, dialect):
+    sql = upsert_sql(table, dialect)
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(sql, rows[start:start + BATCH_SIZE])
+
+def season_partitions(season):
+    """{table: {(year, week): [rows]}} for one snapshot, rows as tuples in TABLES column order"""
+    league_id, year = season['league_id'], season['year']
+    partitions = {
+        'seasons': {(year, 0): [(
+            league_id, year, season['current_week'], completed_weeks(season),
+            get_playoff_start_week(year), int(bool(season.get('final')))
+        )]},
+        'teams': {(year, 0): []}, 'games': {}, 'team_weeks': {}, 'rosters': {(year, 0): []}, 'player_weeks': {}
+    }
+
+    for team in season['teams']:
+        partitions['teams'][(year, 0)].append((
+            league_id, year, team['team_id'], team['team_name'], team['owner'],
+            team['wins'], team['losses'], team['ties'], team['points_for'], team['standing']
+        ))
+        for player in team['roster']:
+            partitions['rosters'][(year, 0)].append((
+                league_id, year, team['team_id'], player['Player ID'], player['Player'], player['Position'],
+                player['Pro Team'], player['Points'], player['Avg Points'], player['Projected Avg Points'],
+                player['Injury Status']
+            ))
+            partitions['player_weeks'].setdefault((year, season['current_week']), []).append((
+                league_id, year, season['current_week'], team['team_id'], player['Player ID'],
+                player['Points'], player['Avg Points'], player['Projected Avg Points'], player['Injury Status']
+            ))
+
+    games = season_games_frame(season)
+    for game in games.itertuples(index=False):
+        partitions['games'].setdefault((year, int(game.week)), []).append(tuple(_plain(value) for value in (
+            league_id, game.year, game.week, game.is_playoff, game.is_bye,
+            game.team1_id, game.team1_score, game.team2_id, game.team2_score
+        )))
+    for row in team_games_frame(games).itertuples(index=False):
+        partitions['team_weeks'].setdefault((year, int(row.week)), []).append(tuple(_plain(value) for value in (
+            league_id, row.year, row.week, row.is_playoff, row.team_id == row.opponent_id,
+            row.team_id, row.owner, row.score, row.opponent_id, row.opponent_owner, row.opponent_score
+        )))
+
+    return partitions
+
+def partition_hash(rows):
+    return hashlib.sha256(json.dumps(rows, default=str).encode()).hexdigest()
+
+def write_partition(cursor, table, league_id, year, week, rows, dialect):
+    """Upsert the rows of a partition that are new or changed and delete the ones no longer in it. Returns rows written."""
+    spec, param = TABLES[table], DIALECTS[dialect]['param']
+    names = [name for name, kind in spec['columns']]
+    key_indexes = [names.index(name) for name in spec['key']]
+
+    def row_key(row):
+        return tuple(row[i] for i in key_indexes)
+
+    where = f"league_id = {param} AND year = {param}" + (f" AND week = {param}" if 'week' in names else "")
+    where_params = (league_id, year, week) if 'week' in names else (league_id, year)
+    cursor.execute(f"SELECT {', '.join(names)} FROM {table} WHERE {where}", where_params)
+    existing = {row_key(row): tuple(row) for row in cursor.fetchall()}
+
+    new_keys = {row_key(row) for row in rows}
+    stale = [key for key in existing if key not in new_keys]
+    rows = [row for row in rows if existing.get(row_key(row)) != tuple(row)]
+
+    if stale:
+        key_match = ' AND '.join(f"{name} = {param}" for name in spec['key'])
+        for start in range(0, len(stale), BATCH_SIZE):
+            cursor.executemany(f"DELETE FROM {table} WHERE {key_match}", stale[start:start + BATCH_SIZE])
+    upsert_rows(cursor, table, rows, dialect)
+    return len(rows) + len(stale)
+
+def export_owners(cursor, league_id, years_by_owner, dialect):
+    """Widen each owner's first/last season with the exported seasons. Returns rows written."""
+    param = DIALECTS[dialect]['param']
+    cursor.execute(f"SELECT owner, first_year, last_year FROM owners WHERE league_id = {param}", (league_id,))
+    existing = {owner: (first_year, last_year) for owner, first_year, last_year in cursor.fetchall()}
+
+    rows = []
+    for owner, years in years_by_owner.items():
+        first_year, last_year = existing.get(owner, (min(years), max(years)))
+        span = (min(first_year, min(years)), max(last_year, max(years)))
+        if existing.get(owner) != span:
+            rows.append((league_id, owner, *span))
+    upsert_rows(cursor, 'owners', rows, dialect)
+    return len(rows)
+
+def export_seasons(conn, seasons, dialect=None):
+    """
+    Write season snapshots (one league or several) into the export tables, creating them if needed.
+    Only partitions whose rows changed since the last export are written. Returns rows written per table.
+    """
+    dialect = dialect or detect_dialect(conn)
+    param = DIALECTS[dialect]['param']
+    create_schema(conn, dialect)
+    written = dict.fromkeys(['seasons', 'owners', 'teams', 'games', 'team_weeks', 'rosters', 'player_weeks'], 0)
+    begin(conn, dialect)
+    cursor = get_cursor(conn, dialect)
+
+    try:
+        years_by_owner = {}
+        for season in seasons:
+            league_id = season['league_id']
+            for team in season['teams']:
+                years_by_owner.setdefault(league_id, {}).setdefault(team['owner'], set()).add(season['year'])
+
+            season_tables = season_partitions(season)
+            for table, partitions in season_tables.items():
+                for (year, week), rows in partitions.items():
+                    row_hash = partition_hash(rows)
+                    cursor.execute(
+                        f"SELECT row_hash FROM export_state WHERE table_name = {param} AND league_id = {param} "
+                        f"AND year = {param} AND week = {param}",
+                        (table, league_id, year, week)
+                    )
+                    stored = cursor.fetchone()
+                    if stored is not None and stored[0] == row_hash:
+                        continue
+
+                    written[table] += write_partition(cursor, table, league_id, year, week, rows, dialect)
+                    upsert_rows(cursor, 'export_state', [(table, league_id, year, week, row_hash, len(rows), time.time())], dialect)
+
+            state_match = f"table_name = {param} AND league_id = {param} AND year = {param}"
+            for table in SNAPSHOT_WEEK_TABLES:
+                cursor.execute(f"SELECT week FROM export_state WHERE {state_match}", (table, league_id, season['year']))
+                for week in [row[0] for row in cursor.fetchall()]:
+                    if (season['year'], week) in season_tables[table]:
+                        continue
+                    written[table] += write_partition(cursor, table, league_id, season['year'], week, [], dialect)
+                    cursor.execute(f"DELETE FROM export_state WHERE {state_match} AND week = {param}",
+                                   (table, league_id, season['year'], week))
+
+        for league_id, owners in years_by_owner.items():
+            written['owners'] += export_owners(cursor, league_id, owners, dialect)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return written
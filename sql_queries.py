@@ -0,0 +1,261 @@
+"""
+H2H matrices, all-time owner stats and standings as indexed aggregate queries over the exported
+tables (see sql_export.py) instead of walks over season snapshots. For the same seasons the results
+match dashboard_data.create_h2h_matrix, calculate_all_time_stats and standings.season_standings.
+
+    conn = connect()  # FFA_SQL_ENGINE / FFA_SQL_DATABASE, or connect('duckdb', 'league.duckdb')
+    h2h_matrix(conn, league_id, 2019, 2024, record_type='regular')
+    all_time_stats(conn, league_id, 2019, 2024)
+    standings(conn, league_id, 2024)
+"""
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from h2h import RECORD_TYPES, h2h_matrix_frame
+from instrumentation import instrumented
+from sql_export import DIALECTS, create_schema, detect_dialect, get_cursor
+from standings import STANDINGS_COLUMNS, streak_label
+
+# 'sqlite' or 'duckdb' (needs the duckdb package), and the database file
+SQL_ENGINE = os.environ.get('FFA_SQL_ENGINE', 'sqlite')
+SQL_DATABASE = os.environ.get(
+    'FFA_SQL_DATABASE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'league_history.db')
+)
+
+# Extra team_weeks filter per record type
+RECORD_FILTERS = {'regular': "AND is_playoff = 0", 'playoffs': "AND is_playoff = 1", 'all': ""}
+
+
+def connect(engine=SQL_ENGINE, database=SQL_DATABASE):
+    """Open the analytics database with the chosen engine, creating the tables and indexes if needed"""
+    if engine == 'sqlite':
+        conn = sqlite3.connect(database)
+    elif engine == 'duckdb':
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The duckdb engine needs the duckdb package (pip install duckdb)")
+        conn = duckdb.connect(database)
+    else:
+        raise ValueError(f"Unknown SQL engine {engine!r} - use 'sqlite' or 'duckdb'")
+
+    create_schema(conn)
+    return conn
+
+def query(conn, sql, params=()):
+    """Rows of a query written with ? placeholders, run in the connection's parameter style"""
+    dialect = detect_dialect(conn)
+    cursor = get_cursor(conn, dialect)
+    cursor.execute(sql.replace('?', DIALECTS[dialect]['param']), params)
+    return cursor.fetchall()
+
+@instrumented('aggregate')
+def h2h_arrays(conn, league_id, start_year, end_year, key='team'):
+    """The H2H arrays of h2h.build_h2h_arrays, with the win/tie/points sums done by the database"""
+    h2h = {'keys': [], 'labels': [], 'label_years': []}
+    index = {}
+    team_seasons = query(conn, """
+        SELECT team_id, team_name, owner, year FROM teams
+        WHERE league_id = ? AND year BETWEEN ? AND ?
+        ORDER BY year, team_id
+    """, (league_id, start_year, end_year))
+    for team_id, team_name, owner, year in team_seasons:
+        team_key, label = (team_id, team_name) if key == 'team' else (owner, owner)
+        if team_key not in index:
+            index[team_key] = len(h2h['keys'])
+            h2h['keys'].append(team_key)
+            h2h['label_years'].append(year)
+            h2h['labels'].append(label)
+        else:
+            # Latest season's name wins
+            h2h['labels'][index[team_key]] = label
+            h2h['label_years'][index[team_key]] = year
+
+    team, opponent = ('team_id', 'opponent_id') if key == 'team' else ('owner', 'opponent_owner')
+    # Two teams with the same owner don't count as a rivalry
+    same_owner = "" if key == 'team' else "AND owner <> opponent_owner"
+    results = query(conn, f"""
+        SELECT {team}, {opponent}, is_playoff,
+               SUM(CASE WHEN score > opponent_score THEN 1 ELSE 0 END),
+               SUM(CASE WHEN score = opponent_score THEN 1 ELSE 0 END),
+               SUM(score)
+        FROM team_weeks
+        WHERE league_id = ? AND year BETWEEN ? AND ? AND is_bye = 0 {same_owner}
+        GROUP BY {team}, {opponent}, is_playoff
+    """, (league_id, start_year, end_year))
+
+    n = len(h2h['keys'])
+    for record_type in ['regular', 'playoffs']:
+        h2h[record_type] = {
+            'wins': np.zeros((n, n), dtype=np.int64),
+            'ties': np.zeros((n, n), dtype=np.int64),
+            'points': np.zeros((n, n), dtype=float)
+        }
+    for team_key, opponent_key, is_playoff, wins, ties, points in results:
+        arrays = h2h['playoffs' if is_playoff else 'regular']
+        i, j = index[team_key], index[opponent_key]
+        arrays['wins'][i, j] = wins
+        arrays['ties'][i, j] = ties
+        arrays['points'][i, j] = points
+
+    h2h['all'] = {name: h2h['regular'][name] + h2h['playoffs'][name] for name in h2h['regular']}
+    return h2h
+
+def h2h_matrix(conn, league_id, start_year, end_year, record_type='all'):
+    """The display matrix of dashboard_data.create_h2h_matrix"""
+    return h2h_matrix_frame(h2h_arrays(conn, league_id, start_year, end_year), record_type)
+
+def h2h_matrices(conn, league_id, start_year, end_year):
+    """All three record types from one query"""
+    h2h = h2h_arrays(conn, league_id, start_year, end_year)
+    return {record_type: h2h_matrix_frame(h2h, record_type) for record_type in RECORD_TYPES}
+
+@instrumented('aggregate')
+def all_time_stats(conn, league_id, start_year, end_year):
+    """
+    All-time statistics keyed by owner, as dashboard_data.calculate_all_time_stats returns them.
+    Byes count as a tie against yourself and years_played counts team-seasons, as there.
+    """
+    rows = query(conn, """
+        WITH team_seasons AS (
+            SELECT t.owner, t.year, t.team_id,
+                   SUM(CASE WHEN w.is_playoff = 0 THEN w.score ELSE 0 END) AS regular_points,
+                   SUM(CASE WHEN w.is_playoff = 0 AND w.score > w.opponent_score THEN 1 ELSE 0 END) AS regular_wins,
+                   SUM(CASE WHEN w.is_playoff = 0 AND w.score < w.opponent_score THEN 1 ELSE 0 END) AS regular_losses,
+                   SUM(CASE WHEN w.is_playoff = 0 AND w.score = w.opponent_score THEN 1 ELSE 0 END) AS regular_ties,
+                   SUM(CASE WHEN w.is_playoff = 1 THEN w.score ELSE 0 END) AS playoff_points,
+                   SUM(CASE WHEN w.is_playoff = 1 AND w.score > w.opponent_score THEN 1 ELSE 0 END) AS playoff_wins,
+                   SUM(CASE WHEN w.is_playoff = 1 AND w.score < w.opponent_score THEN 1 ELSE 0 END) AS playoff_losses,
+                   SUM(CASE WHEN w.is_playoff = 1 AND w.score = w.opponent_score THEN 1 ELSE 0 END) AS playoff_ties,
+                   SUM(CASE WHEN w.is_playoff = 1 THEN 1 ELSE 0 END) AS playoff_games
+            FROM teams t
+            LEFT JOIN team_weeks w ON w.league_id = t.league_id AND w.year = t.year AND w.team_id = t.team_id
+            WHERE t.league_id = ? AND t.year BETWEEN ? AND ?
+            GROUP BY t.owner, t.year, t.team_id
+        )
+        SELECT owner,
+               SUM(regular_points), SUM(regular_wins), SUM(regular_losses), SUM(regular_ties),
+               SUM(playoff_points), SUM(playoff_wins), SUM(playoff_losses), SUM(playoff_ties),
+               SUM(CASE WHEN playoff_games > 0 THEN 1 ELSE 0 END),
+               COUNT(*)
+        FROM team_seasons
+        GROUP BY owner
+        ORDER BY MIN(year), MIN(team_id)
+    """, (league_id, start_year, end_year))
+
+    stats = {}
+    for (owner, regular_points, regular_wins, regular_losses, regular_ties,
+         playoff_points, playoff_wins, playoff_losses, playoff_ties, appearances, years_played) in rows:
+        stats[owner] = {
+            'regular_season': {
+                'total_points': float(regular_points or 0),
+                'wins': int(regular_wins or 0),
+                'losses': int(regular_losses or 0),
+                'ties': int(regular_ties or 0)
+            },
+            'playoffs': {
+                'total_points': float(playoff_points or 0),
+                'wins': int(playoff_wins or 0),
+                'losses': int(playoff_losses or 0),
+                'ties': int(playoff_ties or 0),
+                'appearances': int(appearances)
+            },
+            'years_played': int(years_played)
+        }
+    return stats
+
+@instrumented('aggregate')
+def standings(conn, league_id, year, through_week=None):
+    """
+    Regular season standings through a week (default: every completed regular season week), ordered
+    like standings.build_standings: win %, then head-to-head win % among tied teams, then points for.
+    """
+    season = query(conn, "SELECT completed_weeks, playoff_start_week FROM seasons WHERE league_id = ? AND year = ?",
+                   (league_id, year))
+    if not season:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+    completed, playoff_start_week = season[0]
+    if through_week is None:
+        through_week = min(completed, playoff_start_week - 1)
+    if through_week <= 0:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+
+    # Regular season games through the week, byes left out
+    games_filter = "league_id = ? AND year = ? AND is_playoff = 0 AND is_bye = 0 AND week <= ?"
+    params = (league_id, year, through_week)
+    records = query(conn, f"""
+        SELECT t.team_id, t.team_name, t.owner,
+               SUM(CASE WHEN w.score > w.opponent_score THEN 1 ELSE 0 END),
+               SUM(CASE WHEN w.score < w.opponent_score THEN 1 ELSE 0 END),
+               SUM(CASE WHEN w.score = w.opponent_score THEN 1 ELSE 0 END),
+               SUM(CASE WHEN w.score IS NULL THEN 0 ELSE w.score END),
+               SUM(CASE WHEN w.opponent_score IS NULL THEN 0 ELSE w.opponent_score END)
+        FROM teams t
+        LEFT JOIN (SELECT * FROM team_weeks WHERE {games_filter}) w ON w.team_id = t.team_id
+        WHERE t.league_id = ? AND t.year = ?
+        GROUP BY t.team_id, t.team_name, t.owner
+        ORDER BY t.team_id
+    """, params + (league_id, year))
+    if not records:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+
+    # Current streak: the latest result times the games since the last different result
+    streaks = dict(query(conn, f"""
+        WITH results AS (
+            SELECT team_id, week,
+                   CASE WHEN score > opponent_score THEN 1 WHEN score < opponent_score THEN -1 ELSE 0 END AS result
+            FROM team_weeks WHERE {games_filter}
+        ),
+        latest AS (
+            SELECT r.team_id, r.result FROM results r
+            WHERE r.week = (SELECT MAX(l.week) FROM results l WHERE l.team_id = r.team_id)
+        )
+        SELECT latest.team_id, latest.result * (
+            SELECT COUNT(*) FROM results r
+            WHERE r.team_id = latest.team_id AND r.week > COALESCE(
+                (SELECT MAX(d.week) FROM results d WHERE d.team_id = latest.team_id AND d.result <> latest.result), 0
+            )
+        )
+        FROM latest
+    """, params))
+
+    team_ids = [row[0] for row in records]
+    wins, losses, ties = (np.array([int(row[i] or 0) for row in records]) for i in (3, 4, 5))
+    points_for, points_against = (np.array([float(row[i] or 0) for row in records]) for i in (6, 7))
+    games = wins + losses + ties
+    win_pct = np.divide(wins + ties / 2, games, out=np.zeros(len(games)), where=games > 0)
+
+    # Teams level on win % are split by their games against each other
+    h2h_pct = np.full(len(games), 0.5)
+    for pct in np.unique(win_pct):
+        group = np.flatnonzero(win_pct == pct)
+        if len(group) < 2:
+            continue
+        ids = ', '.join(str(int(team_ids[i])) for i in group)
+        group_records = query(conn, f"""
+            SELECT team_id, SUM(CASE WHEN score > opponent_score THEN 1 ELSE 0 END), COUNT(*)
+            FROM team_weeks WHERE {games_filter} AND team_id IN ({ids}) AND opponent_id IN ({ids})
+            GROUP BY team_id
+        """, params)
+        for team_id, group_wins, group_games in group_records:
+            h2h_pct[team_ids.index(team_id)] = group_wins / group_games
+
+    order = np.lexsort((-points_for, -h2h_pct, -win_pct))
+    points_for, points_against = points_for[order], points_against[order]
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(order) + 1),
+        'Team': [records[i][1] for i in order],
+        'Owner': [records[i][2] for i in order],
+        'Wins': wins[order],
+        'Losses': losses[order],
+        'Ties': ties[order],
+        'Win %': (win_pct[order] * 100).round(1),
+        'Points For': points_for.round(2),
+        'Points Against': points_against.round(2),
+        'Point Diff': (points_for - points_against).round(2),
+        'Streak': [streak_label(streaks.get(team_ids[i], 0)) for i in order]
+    })
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+from games import cached_season_table, season_score_matrix
+from incremental import completed_weeks
+from instrumentation import instrumented
+from league_data import get_playoff_start_week
+
+STANDINGS_COLUMNS = [
+    'Rank', 'Team', 'Owner', 'Wins', 'Losses', 'Ties', 'Win %',
+    'Points For', 'Points Against', 'Point Diff', 'Streak'
+]
+
+
+@instrumented('aggregate')
+def build_standings_weeks(season):
+    """
+    Week-by-week regular season results for every team, rows in season['teams'] order.
+    Cumulative totals are kept per week, so the standings through any week are one column lookup.
+    The table is built once per snapshot - a newer snapshot rebuilds it in full. Byes and playoff
+    weeks don't count.
+    """
+    matrix = season_score_matrix(season)
+    scores, opponents = matrix['scores'], matrix['opponents']
+    n_teams, n_weeks = scores.shape
+    weeks = np.arange(n_weeks)
+    rows = np.arange(n_teams)[:, None]
+
+    opponent_scores = np.where(opponents >= 0, scores[np.maximum(opponents, 0), weeks], np.nan)
+    played = (
+        ~np.isnan(scores) & ~np.isnan(opponent_scores) & (opponents != rows) &
+        (weeks + 1 < get_playoff_start_week(season['year']))
+    )
+    won = played & (scores > opponent_scores)
+    lost = played & (scores < opponent_scores)
+    tied = played & (scores == opponent_scores)
+
+    # Current streak after each week: +k for k straight wins, -k for losses; a tie resets it
+    streaks = np.zeros((n_teams, n_weeks), dtype=np.int64)
+    streak = np.zeros(n_teams, dtype=np.int64)
+    for week in range(n_weeks):
+        streak = np.where(won[:, week], np.maximum(streak, 0) + 1, streak)
+        streak = np.where(lost[:, week], np.minimum(streak, 0) - 1, streak)
+        streak = np.where(tied[:, week], 0, streak)
+        streaks[:, week] = streak
+
+    return {
+        'team_ids': matrix['team_ids'],
+        'opponents': opponents,
+        'won': won,
+        'played': played,
+        'wins': won.cumsum(axis=1),
+        'losses': lost.cumsum(axis=1),
+        'ties': tied.cumsum(axis=1),
+        'points_for': np.where(played, scores, 0).cumsum(axis=1),
+        'points_against': np.where(played, opponent_scores, 0).cumsum(axis=1),
+        'streaks': streaks
+    }
+
+def season_standings_weeks(season):
+    """The week-by-week results for a season snapshot, built once per snapshot"""
+    return cached_season_table(season, 'standings_weeks', build_standings_weeks)
+
+def head_to_head_pct(weeks, group, through_week):
+    """Win % of each team in group (row indexes) in games against the rest of the group"""
+    opponents = weeks['opponents'][group, :through_week]
+    against_group = weeks['played'][group, :through_week] & np.isin(opponents, group)
+    games = against_group.sum(axis=1)
+    wins = (weeks['won'][group, :through_week] & against_group).sum(axis=1)
+    return np.divide(wins, games, out=np.full(len(group), 0.5), where=games > 0)
+
+def standings_order(weeks, through_week):
+    """
+    Row indexes in standings order: win % (ties count half), then head-to-head win % among the
+    teams tied on win %, then points for.
+    """
+    last = through_week - 1
+    wins, losses, ties = weeks['wins'][:, last], weeks['losses'][:, last], weeks['ties'][:, last]
+    games = wins + losses + ties
+    win_pct = np.divide(wins + ties / 2, games, out=np.zeros(len(games)), where=games > 0)
+    points_for = weeks['points_for'][:, last]
+
+    h2h_pct = np.full(len(games), 0.5)
+    for pct in np.unique(win_pct):
+        group = np.flatnonzero(win_pct == pct)
+        if len(group) > 1:
+            h2h_pct[group] = head_to_head_pct(weeks, group, through_week)
+
+    # lexsort sorts by the last key first
+    return np.lexsort((-points_for, -h2h_pct, -win_pct)), win_pct
+
+def streak_label(streak):
+    """W3 for three straight wins, L2 for two losses, - after a tie or before any game"""
+    if streak > 0:
+        return f"W{streak}"
+    if streak < 0:
+        return f"L{-streak}"
+    return '-'
+
+@instrumented('frame')
+def build_standings(season, through_week):
+    """Regular season standings through week index through_week (exclusive) as a display frame"""
+    weeks = season_standings_weeks(season)
+    teams = season['teams']
+    through_week = min(through_week, weeks['wins'].shape[1])
+    if through_week <= 0 or not teams:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+
+    order, win_pct = standings_order(weeks, through_week)
+    last = through_week - 1
+
+    points_for = weeks['points_for'][order, last]
+    points_against = weeks['points_against'][order, last]
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(order) + 1),
+        'Team': [teams[i]['team_name'] for i in order],
+        'Owner': [teams[i]['owner'] for i in order],
+        'Wins': weeks['wins'][order, last],
+        'Losses': weeks['losses'][order, last],
+        'Ties': weeks['ties'][order, last],
+        'Win %': (win_pct[order] * 100).round(1),
+        'Points For': points_for.round(2),
+        'Points Against': points_against.round(2),
+        'Point Diff': (points_for - points_against).round(2),
+        'Streak': [streak_label(streak) for streak in weeks['streaks'][order, last]]
+    })
+
+def standings_weeks_available(season):
+    """Number of completed regular season weeks"""
+    return min(completed_weeks(season), get_playoff_start_week(season['year']) - 1)
+
+def season_standings(season, through_week=None):
+    """
+    Standings through a week (default: every completed regular season week), built once per
+    snapshot and week so switching years or weeks doesn't recompute them.
+    """
+    if through_week is None:
+        through_week = standings_weeks_available(season)
+    return cached_season_table(
+        season, f"standings_{through_week}",
+        lambda season: build_standings(season, through_week)
+    )
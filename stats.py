@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+from games import season_score_matrix
+from instrumentation import instrumented
+from league_data import get_playoff_start_week
+
+
+def new_team_tally(team):
+    """Regular season / playoff totals for one team in one season"""
+    return {
+        'team_id': team['team_id'],
+        'owner': team['owner'],
+        'regular_season': {
+            'total_points': 0,
+            'wins': 0,
+            'losses': 0,
+            'ties': 0
+        },
+        'playoffs': {
+            'total_points': 0,
+            'wins': 0,
+            'losses': 0,
+            'ties': 0
+        }
+    }
+
+def add_season_to_tallies(tallies, season, first_week=0, last_week=None):
+    """
+    Fold a season's team-weeks from week indexes [first_week, last_week) into its per-team tallies.
+    tallies is a list (in team order) updated in place; by default every week up to the current one.
+    Byes count as a tie against yourself, as they always have.
+    """
+    if last_week is None:
+        last_week = season['current_week']
+    tallies_by_id = {tally['team_id']: tally for tally in tallies}
+
+    for team in season['teams']:
+        if team['team_id'] not in tallies_by_id:
+            tallies_by_id[team['team_id']] = new_team_tally(team)
+            tallies.append(tallies_by_id[team['team_id']])
+
+    totals = season_team_totals(season, first_week, last_week)
+    for i, team_id in enumerate(totals['team_ids']):
+        for period in ['regular_season', 'playoffs']:
+            tally = tallies_by_id[team_id][period]
+            tally['total_points'] += float(totals[period]['total_points'][i])
+            for stat in ['wins', 'losses', 'ties']:
+                tally[stat] += int(totals[period][stat][i])
+
+    return tallies
+
+def season_team_totals(season, first_week=0, last_week=None):
+    """
+    Per-team regular season and playoff totals from array operations over the season's score matrix.
+    Returns {'team_ids': [...], 'regular_season'/'playoffs': {'total_points', 'wins', 'losses', 'ties'}}
+    with one array entry per team.
+    """
+    if last_week is None:
+        last_week = season['current_week']
+    matrix = season_score_matrix(season)
+    n_teams, n_weeks = matrix['scores'].shape
+
+    totals = period_totals(
+        matrix['scores'], matrix['opponents'],
+        np.full(n_teams, get_playoff_start_week(season['year'])),
+        np.full(n_teams, first_week), np.full(n_teams, last_week)
+    )
+    totals['team_ids'] = matrix['team_ids']
+    return totals
+
+def period_totals(scores, opponents, playoff_start_weeks, first_weeks, last_weeks):
+    """
+    Regular season / playoff points and W-L-T per row of a (rows, weeks) score matrix.
+    opponents holds the opponent's row in the same matrix (or -1); the other arguments are per row,
+    with week indexes [first_weeks, last_weeks) counted.
+    """
+    weeks = np.arange(scores.shape[1])
+    opponent_scores = np.where(opponents >= 0, scores[np.maximum(opponents, 0), weeks], np.nan)
+    played = (
+        ~np.isnan(scores) & ~np.isnan(opponent_scores) &
+        (weeks >= first_weeks[:, None]) & (weeks < last_weeks[:, None])
+    )
+    playoff_weeks = weeks + 1 >= playoff_start_weeks[:, None]
+
+    totals = {}
+    for period, mask in [('regular_season', played & ~playoff_weeks), ('playoffs', played & playoff_weeks)]:
+        totals[period] = {
+            'total_points': np.where(mask, scores, 0).sum(axis=1),
+            'wins': (mask & (scores > opponent_scores)).sum(axis=1),
+            'losses': (mask & (scores < opponent_scores)).sum(axis=1),
+            'ties': (mask & (scores == opponent_scores)).sum(axis=1)
+        }
+    return totals
+
+def all_time_stats_from_seasons(seasons):
+    """
+    All-time statistics keyed by owner, computed in one pass of array operations over every
+    season's score matrix stacked together. Same result as folding each season into tallies.
+    """
+    seasons = sorted(seasons, key=lambda s: s['year'])
+    matrices = [season_score_matrix(season) for season in seasons]
+    n_rows = sum(matrix['scores'].shape[0] for matrix in matrices)
+    n_weeks = max([matrix['scores'].shape[1] for matrix in matrices], default=0)
+
+    # Stack every season-team as one row; opponents point at rows of the same season
+    scores = np.full((n_rows, n_weeks), np.nan)
+    opponents = np.full((n_rows, n_weeks), -1, dtype=np.intp)
+    playoff_start_weeks = np.zeros(n_rows, dtype=np.intp)
+    last_weeks = np.zeros(n_rows, dtype=np.intp)
+    owners = []
+
+    offset = 0
+    for season, matrix in zip(seasons, matrices):
+        n_teams, season_weeks = matrix['scores'].shape
+        rows = slice(offset, offset + n_teams)
+        scores[rows, :season_weeks] = matrix['scores']
+        opponents[rows, :season_weeks] = np.where(matrix['opponents'] >= 0, matrix['opponents'] + offset, -1)
+        playoff_start_weeks[rows] = get_playoff_start_week(season['year'])
+        last_weeks[rows] = season['current_week']
+        owners.extend(team['owner'] for team in season['teams'])
+        offset += n_teams
+
+    totals = period_totals(scores, opponents, playoff_start_weeks, np.zeros(n_rows, dtype=np.intp), last_weeks)
+
+    # Owners in first-seen order, as the original dict-building loop produced them
+    owner_codes, owner_names = pd.factorize(pd.Series(owners, dtype=object))
+    n_owners = len(owner_names)
+
+    def by_owner(values):
+        return np.bincount(owner_codes, weights=values, minlength=n_owners)
+
+    playoff_games = totals['playoffs']['wins'] + totals['playoffs']['losses'] + totals['playoffs']['ties']
+    appearances = by_owner((playoff_games > 0).astype(float))
+    years_played = np.bincount(owner_codes, minlength=n_owners)
+    period_sums = {
+        period: {stat: by_owner(values.astype(float)) for stat, values in totals[period].items()}
+        for period in totals
+    }
+
+    all_time_stats = {}
+    for code, owner_name in enumerate(owner_names):
+        all_time_stats[owner_name] = {
+            'regular_season': {
+                'total_points': float(period_sums['regular_season']['total_points'][code]),
+                'wins': int(period_sums['regular_season']['wins'][code]),
+                'losses': int(period_sums['regular_season']['losses'][code]),
+                'ties': int(period_sums['regular_season']['ties'][code])
+            },
+            'playoffs': {
+                'total_points': float(period_sums['playoffs']['total_points'][code]),
+                'wins': int(period_sums['playoffs']['wins'][code]),
+                'losses': int(period_sums['playoffs']['losses'][code]),
+                'ties': int(period_sums['playoffs']['ties'][code]),
+                'appearances': int(appearances[code])
+            },
+            'years_played': int(years_played[code])
+        }
+
+    return all_time_stats
+
+@instrumented('aggregate')
+def all_time_stats_from_tallies(season_tallies):
+    """Combine {year: [team tallies]} into all-time statistics keyed by owner"""
+    all_time_stats = {}
+
+    for year in sorted(season_tallies):
+        for tally in season_tallies[year]:
+            owner_name = tally['owner']
+
+            # Initialize owner entry if not exists
+            if owner_name not in all_time_stats:
+                all_time_stats[owner_name] = {
+                    'regular_season': {
+                        'total_points': 0,
+                        'wins': 0,
+                        'losses': 0,
+                        'ties': 0
+                    },
+                    'playoffs': {
+                        'total_points': 0,
+                        'wins': 0,
+                        'losses': 0,
+                        'ties': 0,
+                        'appearances': 0
+                    },
+                    'years_played': 0
+                }
+
+            owner_stats = all_time_stats[owner_name]
+            for period in ['regular_season', 'playoffs']:
+                for stat in ['wins', 'losses', 'ties', 'total_points']:
+                    owner_stats[period][stat] += tally[period][stat]
+
+            # Count playoff appearance if they played any playoff games
+            playoffs = tally['playoffs']
+            if playoffs['wins'] + playoffs['losses'] + playoffs['ties'] > 0:
+                owner_stats['playoffs']['appearances'] += 1
+
+            owner_stats['years_played'] += 1
+
+    return all_time_stats
@@ -0,0 +1,207 @@
+"""
+Synthetic leagues in the season snapshot shape (see league_data.snapshot_league), for scale testing
+without ESPN: any number of teams, seasons, roster size and playoff format.
+
+    seasons = generate_league(n_teams=32, n_seasons=20, roster_size=20, playoff_teams=12)
+    install_league(seasons)  # load_season / the dashboard helpers now read these
+"""
+import math
+import random
+import time
+
+from league_data import SNAPSHOT_VERSION, cache_season, get_playoff_start_week, write_snapshot
+from playoffs import bracket_order
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'D/ST']
+# Share of a roster at each position
+POSITION_WEIGHTS = [2, 5, 5, 2, 1, 1]
+# Season-long points per game around which each position's players are drawn
+POSITION_POINTS = {'QB': 18, 'RB': 11, 'WR': 11, 'TE': 8, 'K': 8, 'D/ST': 7}
+PRO_TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WSH'
+]
+INJURY_STATUSES = ['ACTIVE'] * 17 + ['QUESTIONABLE', 'OUT', 'INJURY_RESERVE']
+
+
+def round_robin(team_ids):
+    """Weekly pairings covering every pair once (circle method). With an odd count, one team a week gets a bye (None)."""
+    slots = list(team_ids) + ([None] if len(team_ids) % 2 else [])
+    rounds = []
+    for _ in range(len(slots) - 1):
+        half = len(slots) // 2
+        rounds.append(list(zip(slots[:half], reversed(slots[half:]))))
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return rounds
+
+def make_roster(roster_size, rng, next_player_id, games):
+    """A roster of roster_size players in the snapshot roster layout"""
+    roster = []
+    for position in rng.choices(POSITIONS, weights=POSITION_WEIGHTS, k=roster_size):
+        avg_points = max(rng.gauss(POSITION_POINTS[position], POSITION_POINTS[position] / 3), 0)
+        roster.append({
+            'Player ID': next_player_id(),
+            'Player': f"Player {rng.randrange(10**6):06d}",
+            'Position': position,
+            'Points': round(avg_points * games, 2),
+            'Avg Points': round(avg_points, 2),
+            'Projected Avg Points': round(max(avg_points + rng.gauss(0, 2), 0), 2),
+            'Pro Team': rng.choice(PRO_TEAMS),
+            'Injury Status': rng.choice(INJURY_STATUSES)
+        })
+    return roster
+
+def generate_season(league_id, year, owners, rng, roster_size=16, playoff_teams=6, playoff_round_weeks=1,
+                    current_week=None, next_player_id=None):
+    """
+    One season snapshot for the given owners (one team each, team_ids 1..n in owner order).
+    The regular season runs until get_playoff_start_week(year), then a seeded bracket of playoff_teams
+    with playoff_round_weeks-week rounds; teams out of the bracket play consolation games, as on ESPN.
+    current_week (default: the whole season) cuts the season off as if it were still in progress.
+    """
+    if next_player_id is None:
+        player_ids = iter(range(1, 10**9))
+        next_player_id = lambda: next(player_ids)
+
+    n_teams = len(owners)
+    team_ids = list(range(1, n_teams + 1))
+    playoff_teams = min(playoff_teams, n_teams)
+    regular_weeks = get_playoff_start_week(year) - 1
+    n_rounds = math.ceil(math.log2(playoff_teams)) if playoff_teams > 1 else 0
+    total_weeks = regular_weeks + n_rounds * playoff_round_weeks
+    current_week = total_weeks if current_week is None else min(current_week, total_weeks)
+
+    # Each team's true strength for the year: weekly scores are drawn around it
+    strength = {team_id: rng.gauss(115, 12) for team_id in team_ids}
+    scores = {team_id: [] for team_id in team_ids}
+    schedule = {team_id: [] for team_id in team_ids}
+
+    def play(week_pairs):
+        for team_id, opponent_id in week_pairs:
+            for a, b in [(team_id, opponent_id), (opponent_id, team_id)]:
+                if a is None:
+                    continue
+                # A bye is the team listed against itself with its own score
+                schedule[a].append(a if b is None else b)
+                scores[a].append(round(max(rng.gauss(strength[a], 25), 0), 2))
+
+    rounds = round_robin(team_ids)
+    rng.shuffle(rounds)
+    for week in range(regular_weeks):
+        play(rounds[week % len(rounds)])
+
+    def regular_season_record(team_id):
+        wins = sum(
+            scores[team_id][week] > scores[opponent_id][week]
+            for week, opponent_id in enumerate(schedule[team_id][:regular_weeks]) if opponent_id != team_id
+        )
+        return wins, sum(scores[team_id][:regular_weeks])
+
+    seeds = sorted(team_ids, key=regular_season_record, reverse=True)
+
+    # Bracket: slots hold team_ids (None for a bye), winners move on; everyone else plays consolation games
+    size = 2 ** n_rounds
+    slots = [seeds[seed - 1] if seed <= playoff_teams else None for seed in bracket_order(size)]
+    eliminated = list(seeds[playoff_teams:])
+    placement = []
+    for _ in range(n_rounds):
+        pairs = list(zip(slots[0::2], slots[1::2]))
+        alive = [team_id for pair in pairs for team_id in pair if team_id is not None]
+        consolation_pairs = list(zip(eliminated[0::2], eliminated[1::2]))
+        if len(eliminated) % 2:
+            consolation_pairs.append((eliminated[-1], None))
+        # Bracket pairs with an empty slot are byes: (team, None)
+        week_pairs = [pair if pair[0] is not None else (pair[1], None) for pair in pairs] + consolation_pairs
+
+        for _ in range(playoff_round_weeks):
+            play(week_pairs)
+
+        round_totals = {
+            team_id: sum(scores[team_id][-playoff_round_weeks:]) for team_id in alive
+        }
+        next_slots = []
+        for team_id, opponent_id in pairs:
+            if team_id is None or opponent_id is None:
+                next_slots.append(team_id if opponent_id is None else opponent_id)
+                continue
+            winner, loser = (team_id, opponent_id) if round_totals[team_id] >= round_totals[opponent_id] else (opponent_id, team_id)
+            next_slots.append(winner)
+            eliminated.append(loser)
+            placement.insert(0, loser)
+        slots = next_slots
+
+    # Final standing: champion, then teams in the order they went out, then the rest by seed
+    standing = [slots[0]] + placement + [team_id for team_id in seeds if team_id not in placement and team_id != slots[0]]
+
+    teams = []
+    for index, team_id in enumerate(team_ids):
+        team_scores = scores[team_id][:current_week]
+        regular = [
+            (scores[team_id][week], scores[opponent_id][week])
+            for week, opponent_id in enumerate(schedule[team_id][:min(current_week, regular_weeks)])
+            if opponent_id != team_id
+        ]
+        teams.append({
+            'team_id': team_id,
+            'team_name': f"{owners[index]}'s Team {year}",
+            'owner': owners[index],
+            'wins': sum(score > opponent_score for score, opponent_score in regular),
+            'losses': sum(score < opponent_score for score, opponent_score in regular),
+            'ties': sum(score == opponent_score for score, opponent_score in regular),
+            'points_for': round(sum(team_scores[:regular_weeks]), 2),
+            'standing': standing.index(team_id) + 1,
+            'scores': team_scores + [0.0] * (total_weeks - current_week),
+            'schedule': schedule[team_id],
+            'roster': make_roster(roster_size, rng, next_player_id, max(current_week, 1))
+        })
+
+    return {
+        'league_id': league_id,
+        'year': year,
+        'current_week': current_week,
+        'settings': {'playoff_team_count': playoff_teams, 'playoff_matchup_period_length': playoff_round_weeks},
+        'teams': teams,
+        'version': SNAPSHOT_VERSION,
+        'fetched_at': time.time(),
+        'final': current_week == total_weeks
+    }
+
+def generate_league(league_id=0, n_teams=12, n_seasons=6, first_year=2019, roster_size=16, playoff_teams=6,
+                    playoff_round_weeks=1, owner_turnover=0.0, current_week=None, seed=0):
+    """
+    A league's history as season snapshots in year order.
+    owner_turnover is the chance each season that a team changes hands; current_week cuts off the
+    last season as if it were in progress. The same arguments always give the same league.
+    """
+    rng = random.Random(seed)
+    player_ids = iter(range(1, 10**9))
+    owners = [f"Owner {i}" for i in range(1, n_teams + 1)]
+    new_owners = iter(range(n_teams + 1, 10**9))
+
+    seasons = []
+    for year in range(first_year, first_year + n_seasons):
+        owners = [f"Owner {next(new_owners)}" if rng.random() < owner_turnover else owner for owner in owners]
+        seasons.append(generate_season(
+            league_id, year, owners, rng, roster_size=roster_size, playoff_teams=playoff_teams,
+            playoff_round_weeks=playoff_round_weeks,
+            current_week=current_week if year == first_year + n_seasons - 1 else None,
+            next_player_id=lambda: next(player_ids)
+        ))
+    return seasons
+
+def generate_leagues(n_leagues, first_league_id=1, **kwargs):
+    """Many independent leagues (seeded by league id), e.g. for multi-tenant scale tests"""
+    return {
+        league_id: generate_league(league_id=league_id, seed=league_id, **kwargs)
+        for league_id in range(first_league_id, first_league_id + n_leagues)
+    }
+
+def install_league(seasons, persist=False):
+    """
+    Serve generated seasons from load_season in this process (and from the snapshot store when persist=True),
+    so the dashboard helpers read them instead of ESPN.
+    """
+    for season in seasons:
+        cache_season(season)
+        if persist:
+            write_snapshot(season)
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import espn_http
+from espn_http import FixtureMissing, PooledEspnRequests
+
+
+class StubEspn:
+    """A local stand-in for ESPN: answers every GET with a league payload after `delay` seconds,
+    or with the next status in `fail_with` while any are left"""
+
+    def __init__(self):
+        self.delay = 0
+        self.fail_with = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status = stub.fail_with.pop(0) if stub.fail_with else 200
+                body = json.dumps({'id': 7, 'path': self.path}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub():
+    stub = StubEspn()
+    yield stub
+    stub.close()
+
+def league_requests(stub, **kwargs):
+    return PooledEspnRequests(sport='nfl', year=2024, league_id=7, base_url=f"{stub.url}/apis/v3/games/", **kwargs)
+
+def test_concurrent_requests_for_a_season_share_one_upstream_call(stub):
+    stub.delay = 0.3
+    responses = []
+
+    def load():
+        responses.append(league_requests(stub, mode='live').league_get(params={'view': 'mTeam'}))
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(stub.requests) == 1
+    assert len(responses) == 8
+    assert all(response == responses[0] for response in responses)
+
+def test_server_errors_are_retried_with_backoff(stub, monkeypatch):
+    delays = []
+    monkeypatch.setattr(espn_http.time, 'sleep', delays.append)
+    stub.fail_with = [503, 502]
+
+    response = league_requests(stub, mode='live').league_get()
+
+    assert response['id'] == 7
+    assert len(stub.requests) == 3
+    assert delays == [espn_http.BACKOFF, espn_http.BACKOFF * 2]
+
+def test_recorded_requests_replay_offline(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(espn_http, 'FIXTURE_DIR', str(tmp_path))
+    recorded = league_requests(stub, mode='record').league_get(params={'view': 'mTeam'})
+    stub.close()
+
+    # Replay never reaches the (now stopped) server
+    replay = league_requests(stub, mode='replay')
+    assert replay.league_get(params={'view': 'mTeam'}) == recorded
+    assert len(stub.requests) == 1
+
+    with pytest.raises(FixtureMissing):
+        replay.league_get(params={'view': 'mMatchup'})
@@ -0,0 +1,31 @@
+import copy
+
+import numpy as np
+
+import league_data
+from incremental import refresh_all_time_stats, refresh_h2h
+from stats import all_time_stats_from_seasons
+from synthetic import generate_league, install_league
+
+
+def test_stat_correction_reaches_folded_aggregates(tmp_path, monkeypatch):
+    monkeypatch.setattr(league_data, 'SNAPSHOT_DIR', str(tmp_path))
+    seasons = generate_league(league_id=901, n_teams=8, n_seasons=2, first_year=2023, current_week=9, seed=4)
+    install_league(seasons)
+    stats, errors = refresh_all_time_stats(901, 2023, 2024)
+    h2h, errors = refresh_h2h(901, 2023, 2024)
+    assert errors == []
+
+    # ESPN corrects a week that is already folded into the persisted aggregates
+    corrected = copy.deepcopy(seasons[-1])
+    corrected['fetched_at'] += 1
+    corrected['teams'][0]['scores'][4] += 30
+    install_league([corrected])
+
+    corrected_stats, errors = refresh_all_time_stats(901, 2023, 2024)
+    owner = corrected['teams'][0]['owner']
+    assert corrected_stats == all_time_stats_from_seasons(seasons[:-1] + [corrected])
+    assert corrected_stats[owner] != stats[owner]
+
+    corrected_h2h, errors = refresh_h2h(901, 2023, 2024)
+    assert np.isclose(corrected_h2h['all']['points'].sum(), h2h['all']['points'].sum() + 30)
@@ -0,0 +1,36 @@
+import copy
+import sqlite3
+
+from sql_export import export_seasons
+from synthetic import generate_league
+
+
+def exported_at(conn, table):
+    rows = conn.execute("SELECT year, week, exported_at FROM export_state WHERE table_name = ?", (table,))
+    return {(year, week): at for year, week, at in rows}
+
+def test_export_rewrites_only_changed_partitions():
+    seasons = generate_league(league_id=902, n_teams=8, n_seasons=2, first_year=2023, current_week=9, seed=2)
+    conn = sqlite3.connect(':memory:')
+    written = export_seasons(conn, seasons)
+    assert written['games'] == conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] > 0
+
+    assert sum(export_seasons(conn, seasons).values()) == 0
+
+    before = exported_at(conn, 'games')
+    corrected = copy.deepcopy(seasons[-1])
+    corrected['fetched_at'] += 1
+    corrected['teams'][0]['scores'][4] += 30
+    written = export_seasons(conn, seasons[:-1] + [corrected])
+
+    # One game and both of its team-weeks, all in week 5 of the corrected season
+    assert written['games'] == 1
+    assert written['team_weeks'] == 2
+    assert sum(written.values()) == 3
+    after = exported_at(conn, 'games')
+    assert [key for key in after if after[key] != before[key]] == [(corrected['year'], 5)]
+    score = conn.execute(
+        "SELECT score FROM team_weeks WHERE year = ? AND week = 5 AND team_id = ?",
+        (corrected['year'], corrected['teams'][0]['team_id'])
+    ).fetchone()[0]
+    assert score == corrected['teams'][0]['scores'][4]
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+import league_data
+import sql_queries
+from dashboard_data import calculate_all_time_stats, create_h2h_matrix
+from sql_export import export_seasons
+from standings import season_standings
+from synthetic import generate_league, install_league
+
+
+@pytest.fixture(params=['sqlite', 'duckdb'])
+def engine(request):
+    if request.param == 'duckdb':
+        pytest.importorskip('duckdb')
+    return request.param
+
+def test_queries_match_python_engines(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(league_data, 'SNAPSHOT_DIR', str(tmp_path))
+    seasons = generate_league(league_id=903, n_teams=9, n_seasons=4, first_year=2021, owner_turnover=0.3,
+                              current_week=9, seed=5)
+    install_league(seasons)
+    conn = sql_queries.connect(engine, str(tmp_path / f"league.{engine}"))
+    export_seasons(conn, seasons)
+
+    for record_type in ['regular', 'playoffs', 'all']:
+        pd.testing.assert_frame_equal(
+            sql_queries.h2h_matrix(conn, 903, 2021, 2024, record_type),
+            create_h2h_matrix(903, 2021, 2024, record_type=record_type)
+        )
+
+    expected = calculate_all_time_stats(903, 2021, 2024, None, None)
+    stats = sql_queries.all_time_stats(conn, 903, 2021, 2024)
+    assert set(stats) == set(expected)
+    for owner, owner_stats in expected.items():
+        assert stats[owner]['years_played'] == owner_stats['years_played']
+        for period in ['regular_season', 'playoffs']:
+            assert stats[owner][period] == pytest.approx(owner_stats[period], abs=1e-6)
+
+    for season in seasons:
+        for through_week in [None, 3]:
+            pd.testing.assert_frame_equal(
+                sql_queries.standings(conn, 903, season['year'], through_week),
+                season_standings(season, through_week).reset_index(drop=True),
+                check_dtype=False
+            )